@@ -49,7 +49,8 @@ class AdvancedAnalytics:
             return
         assert self.db is not None
 
-        # CLV with cohort analysis
+        # CLV with cohort analysis; each joined row is one order (order_id is the
+        # orders PK), so orders are counted without DISTINCT
         clv_query = """
         WITH customer_metrics AS (
             SELECT 
@@ -60,7 +61,7 @@ class AdvancedAnalytics:
                 c.state,
                 MIN(o.order_date) as first_order_date,
                 MAX(o.order_date) as last_order_date,
-                COUNT(DISTINCT o.order_id) as total_orders,
+                COUNT(*) as total_orders,
                 SUM(o.total_amount) as total_revenue,
                 AVG(o.total_amount) as avg_order_value,
                 DATEDIFF(MAX(o.order_date), MIN(o.order_date)) + 1 as customer_lifespan_days,
@@ -289,7 +290,7 @@ class AdvancedAnalytics:
                 YEAR(order_date) as year,
                 MONTH(order_date) as month,
                 DATE_FORMAT(order_date, '%Y-%m') as year_month,
-                COUNT(DISTINCT order_id) as order_count,
+                COUNT(*) as order_count,
                 COUNT(DISTINCT customer_id) as unique_customers,
                 SUM(total_amount) as revenue,
                 AVG(total_amount) as avg_order_value
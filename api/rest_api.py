@@ -5,7 +5,7 @@ Simple REST API using Flask to interact with the MySQL database.
 
 import os
 import sys
-from typing import Optional
+from typing import Dict, Optional
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
@@ -14,6 +14,27 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.database import MySQLConnection
 
+# Columns the list endpoints can return, selectable with ?fields=a,b,c
+CUSTOMER_FIELDS = {
+    name: name
+    for name in ("customer_id", "first_name", "last_name", "email", "city", "state")
+}
+PRODUCT_FIELDS = {
+    "product_id": "p.product_id",
+    "product_name": "p.product_name",
+    "price": "p.price",
+    "stock_quantity": "p.stock_quantity",
+    "sku": "p.sku",
+    "category_name": "c.category_name",
+}
+
+
+def select_fields(fields: Optional[str], columns: Dict[str, str]) -> str:
+    """Build a SELECT list from a ?fields= parameter (all columns if unset)."""
+    requested = [name.strip() for name in (fields or "").split(",")]
+    selected = [name for name in requested if name in columns] or list(columns)
+    return ", ".join(f"{columns[name]} AS {name}" for name in selected)
+
 
 class DatabaseAPI:
     """REST API for database operations."""
@@ -183,6 +204,7 @@ class DatabaseAPI:
                         <ul>
                             <li>All endpoints return JSON data</li>
                             <li>Use <code>?limit=N</code> for pagination</li>
+                            <li>Use <code>?fields=a,b</code> on customer/product lists to return only those columns</li>
                             <li>Search is case-insensitive</li>
                             <li>Click any endpoint above to test it</li>
                         </ul>
@@ -261,8 +283,10 @@ class DatabaseAPI:
                 limit = request.args.get("limit", 50, type=int)
                 offset = request.args.get("offset", 0, type=int)
 
-                query = """
-                SELECT customer_id, first_name, last_name, email, city, state
+                columns = select_fields(request.args.get("fields"), CUSTOMER_FIELDS)
+
+                query = f"""
+                SELECT {columns}
                 FROM customers
                 ORDER BY customer_id
                 LIMIT %s OFFSET %s
@@ -349,10 +373,10 @@ class DatabaseAPI:
                 limit = request.args.get("limit", 50, type=int)
                 offset = request.args.get("offset", 0, type=int)
                 category = request.args.get("category")
+                columns = select_fields(request.args.get("fields"), PRODUCT_FIELDS)
 
-                base_query = """
-                SELECT p.product_id, p.product_name, p.price, p.stock_quantity,
-                       p.sku, c.category_name
+                base_query = f"""
+                SELECT {columns}
                 FROM products p
                 JOIN categories c ON p.category_id = c.category_id
                 """
@@ -556,7 +580,7 @@ class DatabaseAPI:
                 query = """
                 SELECT 
                     DATE_FORMAT(order_date, '%Y-%m') as month,
-                    COUNT(DISTINCT order_id) as order_count,
+                    COUNT(*) as order_count,
                     COUNT(DISTINCT customer_id) as customer_count,
                     SUM(total_amount) as total_revenue,
                     AVG(total_amount) as avg_order_value
@@ -2,12 +2,16 @@
 Database connection configuration and utilities.
 """
 
+import atexit
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import mysql.connector
 from dotenv import load_dotenv
-from mysql.connector import Error
+from mysql.connector import Error, pooling
 
 # Load environment variables
 load_dotenv(override=True)
@@ -23,41 +27,158 @@ class DatabaseConfig:
     DATABASE = os.getenv("DB_NAME", "practice_db")
     POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
     MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", 25))
 
 
 class MySQLConnection:
     """MySQL connection manager using mysql-connector-python."""
 
-    def __init__(self):
+    _shared: Optional["MySQLConnection"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        pool: Optional[pooling.MySQLConnectionPool] = None,
+        isolation_level: Optional[str] = None,
+    ):
+        self.pool = pool
+        # Session isolation level (e.g. "READ COMMITTED") applied on connect
+        self.isolation_level = isolation_level
         self.connection: Optional[Any] = None
         self.cursor: Optional[Any] = None
+        # Plain (tuple-row) cursor, opened on first use and reused after that
+        self._tuple_cursor: Optional[Any] = None
+        # (SQL text, dictionary) -> (statement, prepared cursor), least recently
+        # used first; bounded by DatabaseConfig.STMT_CACHE_SIZE
+        self._stmt_cache: "OrderedDict[Tuple[str, bool], Tuple[str, Any]]" = (
+            OrderedDict()
+        )
+        self._stmt_cache_hits = 0
+        self._stmt_cache_misses = 0
+        # Set inside transaction(); per-call commits/rollbacks are deferred to it
+        self._in_transaction = False
+        # Most recent error caught by a helper, for callers that need its errno
+        self.last_error: Optional[Error] = None
+
+    @classmethod
+    def shared(cls) -> "MySQLConnection":
+        """Return a process-wide connection, connecting on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                instance = cls()
+                if not instance.connect():
+                    return instance
+                atexit.register(instance.disconnect)
+                cls._shared = instance
+            return cls._shared
 
     def connect(self):
-        """Establish database connection."""
+        """Establish database connection (checked out of the pool, if any)."""
+        connection = None
         try:
-            self.connection = mysql.connector.connect(
-                host=DatabaseConfig.HOST,
-                port=DatabaseConfig.PORT,
-                user=DatabaseConfig.USER,
-                password=DatabaseConfig.PASSWORD,
-                database=DatabaseConfig.DATABASE,
-                autocommit=False,
-            )
-            self.cursor = self.connection.cursor(dictionary=True)
+            if self.pool:
+                connection = self.pool.get_connection()
+            else:
+                connection = mysql.connector.connect(
+                    host=DatabaseConfig.HOST,
+                    port=DatabaseConfig.PORT,
+                    user=DatabaseConfig.USER,
+                    password=DatabaseConfig.PASSWORD,
+                    database=DatabaseConfig.DATABASE,
+                    autocommit=False,
+                )
+            cursor = connection.cursor(dictionary=True)
+            if self.isolation_level:
+                cursor.execute(
+                    f"SET SESSION TRANSACTION ISOLATION LEVEL {self.isolation_level}"
+                )
+            self.connection, self.cursor = connection, cursor
             print("Connected to MySQL database successfully!")
             return True
         except Error as e:
+            self.last_error = e
             print(f"Error connecting to MySQL: {e}")
+            if connection is not None:
+                try:
+                    # A pooled connection goes back to the pool instead of leaking
+                    connection.close()
+                except Error:
+                    pass
             return False
 
     def disconnect(self):
         """Close database connection."""
+        for _, cursor in self._stmt_cache.values():
+            cursor.close()
+        self._stmt_cache.clear()
+        if self._tuple_cursor:
+            self._tuple_cursor.close()
+            self._tuple_cursor = None
         if self.cursor:
             self.cursor.close()
         if self.connection and self.connection.is_connected():
+            if self.connection.in_transaction:
+                # A pooled connection may go back without a session reset
+                self.connection.rollback()
             self.connection.close()
             print("MySQL connection closed.")
 
+    def _commit(self):
+        """Commit, unless a transaction() block will or nothing is open."""
+        # in_transaction comes from the server status flags of the last reply,
+        # so checking it costs no round trip
+        if not self._in_transaction and self.connection.in_transaction:
+            self.connection.commit()
+
+    def _rollback(self):
+        """Roll back, unless a transaction() block owns it or nothing is open."""
+        if not self._in_transaction and self.connection.in_transaction:
+            self.connection.rollback()
+
+    @contextmanager
+    def transaction(
+        self, isolation_level: Optional[str] = None, read_only: bool = False
+    ) -> Iterator["MySQLConnection"]:
+        """Run the enclosed calls as one transaction with a single COMMIT.
+
+        isolation_level (e.g. "READ COMMITTED") applies to this transaction only;
+        read_only lets InnoDB skip transaction id and undo setup for pure reads.
+        If a helper call in the block fails (sets last_error), the whole block
+        is rolled back instead of committed.
+        """
+        if not self.connection:
+            print("No database connection available.")
+            yield self
+            return
+
+        if isolation_level or read_only:
+            if self.connection.in_transaction:
+                # End the snapshot left open by earlier reads
+                self.connection.commit()
+            self.connection.start_transaction(
+                isolation_level=isolation_level, readonly=read_only
+            )
+        # Otherwise no BEGIN is sent: with autocommit off, the first statement
+        # in the block opens the transaction (or continues an open read one)
+        error_before = self.last_error
+        self._in_transaction = True
+        try:
+            yield self
+            if self.last_error is not error_before:
+                # A helper caught an error inside the block; don't commit the
+                # statements that did succeed
+                print(f"Transaction rolled back: {self.last_error}")
+                if self.connection.in_transaction:
+                    self.connection.rollback()
+            elif self.connection.in_transaction:
+                self.connection.commit()
+        except Exception:
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            raise
+        finally:
+            self._in_transaction = False
+
     def execute_query(
         self, query: str, params: Optional[tuple] = None
     ) -> Optional[List[Dict[str, Any]]]:
@@ -70,9 +191,167 @@ class MySQLConnection:
             self.cursor.execute(query, params or ())
             return self.cursor.fetchall()
         except Error as e:
+            self.last_error = e
             print(f"Error executing query: {e}")
             return None
 
+    def execute_query_one(
+        self, query: str, params: Optional[tuple] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Execute a SELECT query and return only its first row."""
+        if not self.cursor:
+            print("No database connection available.")
+            return None
+
+        try:
+            self.cursor.execute(query, params or ())
+            row = self.cursor.fetchone()
+            # Discard any further rows so the cursor is ready for the next query
+            self.cursor.fetchall()
+            return row
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing query: {e}")
+            return None
+
+    def _plain_cursor(self) -> Any:
+        """Return the connection's reusable tuple-row cursor."""
+        if self._tuple_cursor is None:
+            self._tuple_cursor = self.connection.cursor()
+        return self._tuple_cursor
+
+    def _prepared_cursor(self, query: str, dictionary: bool) -> Tuple[str, Any]:
+        """Return (statement, prepared cursor) for query, preparing it once."""
+        key = (query, dictionary)
+        if key in self._stmt_cache:
+            self._stmt_cache_hits += 1
+            self._stmt_cache.move_to_end(key)
+            return self._stmt_cache[key]
+
+        self._stmt_cache_misses += 1
+        if len(self._stmt_cache) >= DatabaseConfig.STMT_CACHE_SIZE:
+            # Closing the cursor deallocates its statement on the server
+            _, (_, evicted) = self._stmt_cache.popitem(last=False)
+            evicted.close()
+        cursor = self.connection.cursor(prepared=True, dictionary=dictionary)
+        self._stmt_cache[key] = (query, cursor)
+        return self._stmt_cache[key]
+
+    def prepared_cache_stats(self) -> Dict[str, int]:
+        """Return prepared statement cache size, hits and misses."""
+        return {
+            "size": len(self._stmt_cache),
+            "hits": self._stmt_cache_hits,
+            "misses": self._stmt_cache_misses,
+        }
+
+    def execute_query_prepared(
+        self, query: str, params: Optional[tuple] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Execute a SELECT query as a prepared statement cached by SQL text."""
+        if not self.connection:
+            print("No database connection available.")
+            return None
+
+        try:
+            statement, cursor = self._prepared_cursor(query, dictionary=True)
+            # Passing the cached string object lets the cursor skip re-preparing
+            cursor.execute(statement, params or ())
+            return cursor.fetchall()
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing prepared query: {e}")
+            return None
+
+    def execute_query_tuple(
+        self, query: str, params: Optional[tuple] = None, prepared: bool = False
+    ) -> Optional[Tuple[List[tuple], List[tuple]]]:
+        """Execute a SELECT query and return (cursor.description, tuple rows)."""
+        if not self.connection:
+            print("No database connection available.")
+            return None
+
+        if prepared:
+            statement, cursor = self._prepared_cursor(query, dictionary=False)
+        else:
+            statement, cursor = query, self._plain_cursor()
+        try:
+            cursor.execute(statement, params or ())
+            return cursor.description, cursor.fetchall()
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing query: {e}")
+            return None
+
+    def execute_multi(
+        self, queries: List[str], params: Optional[tuple] = None
+    ) -> Optional[List[Tuple[List[tuple], List[tuple]]]]:
+        """Execute several SELECT queries in one round trip.
+
+        Returns (cursor.description, tuple rows) for each query, in order.
+        """
+        if not self.connection:
+            print("No database connection available.")
+            return None
+
+        cursor = self._plain_cursor()
+        try:
+            return [
+                (result.description, result.fetchall())
+                for result in cursor.execute(
+                    ";\n".join(queries), params or (), multi=True
+                )
+                if result.with_rows
+            ]
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing queries: {e}")
+            return None
+
+    def execute_query_stream(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        prepared: bool = False,
+        limit: Optional[int] = None,
+        dictionary: bool = False,
+    ) -> Iterator[Any]:
+        """Execute a SELECT query and yield rows as the server sends them.
+
+        Rows are tuples, or dicts when dictionary is set. limit appends a
+        LIMIT clause, so query must not end with one.
+        """
+        if not self.connection:
+            print("No database connection available.")
+            return
+
+        if limit is not None:
+            query = f"{query.rstrip()} LIMIT %s"
+            params = tuple(params or ()) + (limit,)
+
+        if prepared:
+            statement, cursor = self._prepared_cursor(query, dictionary)
+        else:
+            statement = query
+            cursor = self.connection.cursor(buffered=False, dictionary=dictionary)
+        try:
+            cursor.execute(statement, params or ())
+            rows = cursor.fetchmany(256)
+            while rows:
+                yield from rows
+                rows = cursor.fetchmany(256)
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing query: {e}")
+        finally:
+            try:
+                # Rows left unread (early break) would block the next statement
+                cursor.fetchall()
+            except Error:
+                pass
+            if not prepared:
+                cursor.close()
+
     def execute_update(self, query: str, params: Optional[tuple] = None) -> int:
         """Execute INSERT, UPDATE, or DELETE query."""
         if not self.cursor or not self.connection:
@@ -81,28 +360,53 @@ class MySQLConnection:
 
         try:
             self.cursor.execute(query, params or ())
-            self.connection.commit()
+            self._commit()
             return self.cursor.rowcount
         except Error as e:
+            self.last_error = e
             print(f"Error executing update: {e}")
-            self.connection.rollback()
+            self._rollback()
             return 0
 
-    def execute_update_with_id(
+    def execute_update_prepared(
         self, query: str, params: Optional[tuple] = None
+    ) -> int:
+        """Execute INSERT, UPDATE, or DELETE as a prepared statement cached by SQL text."""
+        if not self.connection:
+            print("No database connection available.")
+            return 0
+
+        try:
+            statement, cursor = self._prepared_cursor(query, dictionary=False)
+            cursor.execute(statement, params or ())
+            self._commit()
+            return cursor.rowcount
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing prepared update: {e}")
+            self._rollback()
+            return 0
+
+    def execute_update_with_id(
+        self, query: str, params: Optional[tuple] = None, prepared: bool = False
     ) -> Optional[int]:
         """Execute INSERT query and return the last inserted ID."""
         if not self.cursor or not self.connection:
             print("No database connection available.")
             return None
 
+        if prepared:
+            statement, cursor = self._prepared_cursor(query, dictionary=False)
+        else:
+            statement, cursor = query, self.cursor
         try:
-            self.cursor.execute(query, params or ())
-            self.connection.commit()
-            return self.cursor.lastrowid
+            cursor.execute(statement, params or ())
+            self._commit()
+            return cursor.lastrowid
         except Error as e:
+            self.last_error = e
             print(f"Error executing update: {e}")
-            self.connection.rollback()
+            self._rollback()
             return None
 
     def execute_many(self, query: str, data_list: List[tuple]) -> int:
@@ -113,13 +417,58 @@ class MySQLConnection:
 
         try:
             self.cursor.executemany(query, data_list)
-            self.connection.commit()
+            self._commit()
             return self.cursor.rowcount
         except Error as e:
+            self.last_error = e
             print(f"Error executing batch query: {e}")
-            self.connection.rollback()
+            self._rollback()
             return 0
 
+    def call_procedure_results(
+        self, name: str, args: tuple = ()
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """Call a stored procedure and return each of its result sets."""
+        if not self.cursor or not self.connection:
+            print("No database connection available.")
+            return None
+
+        try:
+            self.cursor.callproc(name, args)
+            results = [result.fetchall() for result in self.cursor.stored_results()]
+            self._commit()
+            return results
+        except Error as e:
+            self.last_error = e
+            print(f"Error calling procedure: {e}")
+            self._rollback()
+            return None
+
+    def execute_script(
+        self, script: str, params: Optional[tuple] = None
+    ) -> List[Tuple[str, int]]:
+        """Execute ;-separated statements in one round trip.
+
+        Returns (statement, rowcount) for each executed statement.
+        """
+        if not self.cursor or not self.connection:
+            print("No database connection available.")
+            return []
+
+        try:
+            executed = []
+            for result in self.cursor.execute(script, params or (), multi=True):
+                if result.with_rows:
+                    result.fetchall()
+                executed.append((result.statement, result.rowcount))
+            self._commit()
+            return executed
+        except Error as e:
+            self.last_error = e
+            print(f"Error executing script: {e}")
+            self._rollback()
+            return []
+
     def __enter__(self):
         """Context manager entry."""
         self.connect()
@@ -154,6 +503,29 @@ def create_connection():
         return None
 
 
+def create_connection_pool(
+    pool_name: str = "practice_pool",
+    pool_size: Optional[int] = None,
+    reset_session: bool = True,
+) -> Optional[pooling.MySQLConnectionPool]:
+    """Create a connection pool; pooled connections return to it on close().
+
+    reset_session=False skips the session reset round trip on each return,
+    so session settings carry over to the next checkout.
+    """
+    try:
+        return pooling.MySQLConnectionPool(
+            pool_name=pool_name,
+            pool_size=pool_size or DatabaseConfig.POOL_SIZE,
+            pool_reset_session=reset_session,
+            autocommit=False,
+            **get_db_config(),
+        )
+    except Error as e:
+        print(f"Error creating connection pool: {e}")
+        return None
+
+
 def get_db_config() -> Dict[str, Any]:
     """Get database configuration as dictionary."""
     return {
@@ -10,25 +10,41 @@ import requests
 
 API_BASE_URL = "http://localhost:5002"
 
+# Sections shown by the demo (description -> endpoint)
+DEMO_ENDPOINTS = {
+    "Database Statistics": "/api/stats",
+    "First 3 Customers": "/api/customers?limit=3&fields=customer_id,first_name,last_name,email",
+    "First 5 Products": "/api/products?limit=5&fields=product_id,product_name,price",
+    "Top 3 Products by Sales": "/api/analytics/top-products?limit=3",
+    "Monthly Sales Analytics": "/api/analytics/sales-by-month",
+    "Search for 'John' in Customers": "/api/search/customers?q=John",
+}
+
+
+def print_response(endpoint: str, status_code: int, data, text: str = "") -> None:
+    """Display one endpoint's JSON response."""
+    if status_code == 200:
+        print(f"✅ Success: {endpoint}")
+        pretty = json.dumps(data, indent=2)
+        # Responses narrowed with fields= are small, so show them in full
+        if len(pretty) > 500 and "fields=" not in endpoint:
+            pretty = pretty[:500] + "..."
+        print(pretty)
+    else:
+        print(f"❌ Error {status_code}: {text or data}")
 
-def test_api_endpoint(endpoint: str, description: str) -> None:
-    """Test an API endpoint and display results."""
-    print(f"\n🔍 {description}")
-    print("=" * 50)
 
+def test_demo_endpoints() -> None:
+    """Fetch every demo section over one keep-alive session and display each."""
     try:
-        response = requests.get(f"{API_BASE_URL}{endpoint}")
-
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Success: {endpoint}")
-            print(
-                json.dumps(data, indent=2)[:500] + "..."
-                if len(str(data)) > 500
-                else json.dumps(data, indent=2)
-            )
-        else:
-            print(f"❌ Error {response.status_code}: {response.text}")
+        # One Session reuses a single connection instead of reconnecting per GET
+        with requests.Session() as session:
+            for description, endpoint in DEMO_ENDPOINTS.items():
+                print(f"\n🔍 {description}")
+                print("=" * 50)
+                response = session.get(f"{API_BASE_URL}{endpoint}")
+                data = response.json() if response.status_code == 200 else None
+                print_response(endpoint, response.status_code, data, response.text)
 
     except requests.exceptions.ConnectionError:
         print(f"❌ Connection failed. Make sure API is running at {API_BASE_URL}")
@@ -43,12 +59,7 @@ def main():
     print(f"Testing API at: {API_BASE_URL}")
 
     # Test various endpoints
-    test_api_endpoint("/api/stats", "Database Statistics")
-    test_api_endpoint("/api/customers?limit=3", "First 3 Customers")
-    test_api_endpoint("/api/products?limit=5", "First 5 Products")
-    test_api_endpoint("/api/analytics/top-products?limit=3", "Top 3 Products by Sales")
-    test_api_endpoint("/api/analytics/sales-by-month", "Monthly Sales Analytics")
-    test_api_endpoint("/api/search/customers?q=John", "Search for 'John' in Customers")
+    test_demo_endpoints()
 
     print(f"\n🎉 Demo complete!")
     print(f"💻 Visit {API_BASE_URL} in your browser for the interactive interface")
@@ -0,0 +1,4 @@
+"""
+Runnable MySQL example scripts.
+Run as modules from the project root, e.g. `python -m examples.basic_operations`.
+"""
@@ -5,23 +5,39 @@ This module demonstrates complex queries, joins, subqueries, and analytical func
 
 import os
 import sys
-from typing import Optional
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Standalone script runs need the project root on sys.path.
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import MySQLConnection
+from mysql.connector import pooling
+
+from config.database import MySQLConnection, create_connection_pool
+from utils.concurrent_runner import run_concurrently
+
+# Read-only demos; each one runs on its own pooled connection.
+DEMO_METHODS = (
+    "complex_joins_demo",
+    "subqueries_demo",
+    "window_functions_demo",
+    "analytical_queries_demo",
+    "pivot_like_queries_demo",
+)
 
 
 class AdvancedQueries:
     """Advanced MySQL queries demonstrations."""
 
-    def __init__(self):
+    def __init__(self, pool: Optional[pooling.MySQLConnectionPool] = None):
+        self.pool = pool
         self.db: Optional[MySQLConnection] = None
 
     def setup(self) -> bool:
         """Setup database connection."""
         try:
-            self.db = MySQLConnection()
+            self.db = MySQLConnection(self.pool)
             return self.db.connect()
         except Exception as e:
             print(f"Failed to setup database connection: {e}")
@@ -32,6 +48,16 @@ class AdvancedQueries:
         if self.db:
             self.db.disconnect()
 
+    def _query_rows(self, query: str, params: Optional[tuple] = None) -> List[Any]:
+        """Execute a SELECT query and return its rows as namedtuples."""
+        assert self.db is not None
+        result = self.db.execute_query_tuple(query, params)
+        if not result:
+            return []
+        description, rows = result
+        Row = namedtuple("Row", [column[0] for column in description])._make
+        return list(map(Row, rows))
+
     def _check_connection(self) -> bool:
         """Check if database connection is available."""
         if not self.db:
@@ -56,8 +82,8 @@ class AdvancedQueries:
             COUNT(DISTINCT o.order_id) as total_orders,
             COUNT(oi.order_item_id) as total_items,
             SUM(oi.quantity) as total_quantity,
-            SUM(oi.total_price) as total_spent,
-            AVG(o.total_amount) as avg_order_value,
+            FORMAT(SUM(oi.total_price), 2) as total_spent,
+            FORMAT(AVG(o.total_amount), 2) as avg_order_value,
             MAX(o.order_date) as last_order_date,
             GROUP_CONCAT(DISTINCT cat.category_name ORDER BY cat.category_name) as categories_purchased
         FROM customers c
@@ -67,22 +93,20 @@ class AdvancedQueries:
         LEFT JOIN categories cat ON p.category_id = cat.category_id
         GROUP BY c.customer_id, c.first_name, c.last_name, c.email
         HAVING total_orders > 0
-        ORDER BY total_spent DESC
+        ORDER BY SUM(oi.total_price) DESC
         """
 
         try:
-            results = self.db.execute_query(complex_join_query)
+            results = self._query_rows(complex_join_query)
             if results:
                 for row in results:
-                    print(f"   {row['customer_name']} ({row['email']}):")
-                    print(
-                        f"     Orders: {row['total_orders']}, Items: {row['total_items']}"
-                    )
+                    print(f"   {row.customer_name} ({row.email}):")
+                    print(f"     Orders: {row.total_orders}, Items: {row.total_items}")
                     print(
-                        f"     Total Spent: ${row['total_spent']:.2f}, Avg Order: ${row['avg_order_value']:.2f}"
+                        f"     Total Spent: ${row.total_spent}, Avg Order: ${row.avg_order_value}"
                     )
-                    print(f"     Categories: {row['categories_purchased']}")
-                    print(f"     Last Order: {row['last_order_date']}")
+                    print(f"     Categories: {row.categories_purchased}")
+                    print(f"     Last Order: {row.last_order_date}")
                     print()
         except Exception as e:
             print(f"   Error: {e}")
@@ -117,14 +141,14 @@ class AdvancedQueries:
         """
 
         try:
-            results = self.db.execute_query(correlated_subquery)
+            results = self._query_rows(correlated_subquery)
             if results:
                 for row in results:
-                    print(f"   {row['product_name']} ({row['category_name']})")
+                    print(f"   {row.product_name} ({row.category_name})")
                     print(
-                        f"     Price: ${row['price']:.2f} vs Category Avg: ${row['category_avg_price']:.2f}"
+                        f"     Price: ${row.price:.2f} vs Category Avg: ${row.category_avg_price:.2f}"
                     )
-                    print(f"     Difference: +${row['price_difference']:.2f}")
+                    print(f"     Difference: +${row.price_difference:.2f}")
                     print()
         except Exception as e:
             print(f"   Error: {e}")
@@ -160,13 +184,11 @@ class AdvancedQueries:
         """
 
         try:
-            results = self.db.execute_query(exists_subquery)
+            results = self._query_rows(exists_subquery)
             if results:
                 for row in results:
-                    print(f"   {row['customer_name']} ({row['email']})")
-                    print(
-                        f"     Categories: {row['categories_count']} - {row['categories']}"
-                    )
+                    print(f"   {row.customer_name} ({row.email})")
+                    print(f"     Categories: {row.categories_count} - {row.categories}")
                     print()
             else:
                 print("   No customers found with multi-category orders")
@@ -198,19 +220,19 @@ class AdvancedQueries:
         """
 
         try:
-            results = self.db.execute_query(window_query)
+            results = self._query_rows(window_query)
             if results:
                 current_category = ""
                 for row in results:
-                    if row["category_name"] != current_category:
-                        current_category = row["category_name"]
+                    if row.category_name != current_category:
+                        current_category = row.category_name
                         print(f"\n   {current_category}:")
 
                     print(
-                        f"     #{row['price_rank']} {row['product_name']}: ${row['price']:.2f}"
+                        f"     #{row.price_rank} {row.product_name}: ${row.price:.2f}"
                     )
                     print(
-                        f"         vs avg ${row['category_avg_price']:.2f} ({row['price_vs_avg']:+.2f})"
+                        f"         vs avg ${row.category_avg_price:.2f} ({row.price_vs_avg:+.2f})"
                     )
         except Exception as e:
             print(f"   Error (Window functions may not be supported): {e}")
@@ -229,14 +251,14 @@ class AdvancedQueries:
         """
 
         try:
-            results = self.db.execute_query(running_total_query)
+            results = self._query_rows(running_total_query)
             if results:
                 for row in results:
                     print(
-                        f"   {row['order_date']} Order #{row['order_id']}: ${row['total_amount']:.2f}"
+                        f"   {row.order_date} Order #{row.order_id}: ${row.total_amount:.2f}"
                     )
                     print(
-                        f"     Running Total: ${row['running_total']:.2f}, 3-Order Avg: ${row['moving_avg_3']:.2f}"
+                        f"     Running Total: ${row.running_total:.2f}, 3-Order Avg: ${row.moving_avg_3:.2f}"
                     )
         except Exception as e:
             print(f"   Error (Window functions may not be supported): {e}")
@@ -256,17 +278,17 @@ class AdvancedQueries:
             DATE_FORMAT(order_date, '%Y-%m') as order_month,
             COUNT(DISTINCT customer_id) as new_customers,
             COUNT(order_id) as total_orders,
-            SUM(total_amount) as monthly_revenue,
-            AVG(total_amount) as avg_order_value,
-            MIN(total_amount) as min_order,
-            MAX(total_amount) as max_order
+            FORMAT(SUM(total_amount), 2) as monthly_revenue,
+            FORMAT(AVG(total_amount), 2) as avg_order_value,
+            FORMAT(MIN(total_amount), 2) as min_order,
+            FORMAT(MAX(total_amount), 2) as max_order
         FROM orders
         GROUP BY DATE_FORMAT(order_date, '%Y-%m')
         ORDER BY order_month
         """
 
         try:
-            results = self.db.execute_query(cohort_query)
+            results = self._query_rows(cohort_query)
             if results:
                 print(
                     "   Month    | Customers | Orders | Revenue  | Avg Order | Min   | Max"
@@ -276,7 +298,7 @@ class AdvancedQueries:
                 )
                 for row in results:
                     print(
-                        f"   {row['order_month']}  |    {row['new_customers']:2d}     |   {row['total_orders']:2d}   | ${row['monthly_revenue']:6.2f} | ${row['avg_order_value']:7.2f} | ${row['min_order']:5.2f} | ${row['max_order']:6.2f}"
+                        f"   {row.order_month}  |    {row.new_customers:2d}     |   {row.total_orders:2d}   | ${row.monthly_revenue:>6} | ${row.avg_order_value:>7} | ${row.min_order:>5} | ${row.max_order:>6}"
                     )
         except Exception as e:
             print(f"   Error: {e}")
@@ -307,21 +329,17 @@ class AdvancedQueries:
         """
 
         try:
-            results = self.db.execute_query(performance_query)
+            results = self._query_rows(performance_query)
             if results:
                 for row in results:
-                    print(f"   {row['product_name']} ({row['category_name']})")
-                    print(
-                        f"     Price: ${row['price']:.2f}, Stock: {row['stock_quantity']}"
-                    )
+                    print(f"   {row.product_name} ({row.category_name})")
+                    print(f"     Price: ${row.price:.2f}, Stock: {row.stock_quantity}")
                     print(
-                        f"     Sold: {row['total_sold']}, Revenue: ${row['total_revenue']:.2f}"
+                        f"     Sold: {row.total_sold}, Revenue: ${row.total_revenue:.2f}"
                     )
-                    print(f"     Category: {row['performance_category']}")
-                    if row["avg_selling_price"]:
-                        print(
-                            f"     Avg Selling Price: ${row['avg_selling_price']:.2f}"
-                        )
+                    print(f"     Category: {row.performance_category}")
+                    if row.avg_selling_price:
+                        print(f"     Avg Selling Price: ${row.avg_selling_price:.2f}")
                     print()
         except Exception as e:
             print(f"   Error: {e}")
@@ -334,21 +352,30 @@ class AdvancedQueries:
             return
         assert self.db is not None
 
-        # Category sales by month (pivot-like)
+        # Category sales by month (pivot-like), one column per category
         print("\n1. Category sales by month:")
-        pivot_query = """
+        categories = self._pivot_categories()
+        if not categories:
+            print("   No categories found")
+            return
+
+        # Compare on the integer category_id rather than the name string
+        columns = [
+            (int(cat["category_id"]), cat["category_name"]) for cat in categories
+        ]
+        pivot_columns = ",\n            ".join(
+            f"FORMAT(SUM(CASE WHEN p.category_id = {cid} "
+            f"THEN oi.total_price ELSE 0 END), 2) as cat_{cid}"
+            for cid, _ in columns
+        )
+        pivot_query = f"""
         SELECT 
             DATE_FORMAT(o.order_date, '%Y-%m') as month,
-            SUM(CASE WHEN c.category_name = 'Electronics' THEN oi.total_price ELSE 0 END) as Electronics,
-            SUM(CASE WHEN c.category_name = 'Clothing' THEN oi.total_price ELSE 0 END) as Clothing,
-            SUM(CASE WHEN c.category_name = 'Books' THEN oi.total_price ELSE 0 END) as Books,
-            SUM(CASE WHEN c.category_name = 'Sports' THEN oi.total_price ELSE 0 END) as Sports,
-            SUM(CASE WHEN c.category_name = 'Home & Garden' THEN oi.total_price ELSE 0 END) as Home_Garden,
-            SUM(oi.total_price) as Total
+            {pivot_columns},
+            FORMAT(SUM(oi.total_price), 2) as Total
         FROM orders o
         JOIN order_items oi ON o.order_id = oi.order_id
         JOIN products p ON oi.product_id = p.product_id
-        JOIN categories c ON p.category_id = c.category_id
         GROUP BY DATE_FORMAT(o.order_date, '%Y-%m')
         ORDER BY month
         """
@@ -356,37 +383,47 @@ class AdvancedQueries:
         try:
             results = self.db.execute_query(pivot_query)
             if results:
-                print(
-                    "   Month   | Electronics | Clothing | Books   | Sports  | Home&Garden | Total"
-                )
-                print(
-                    "   --------|-------------|----------|---------|---------|-------------|--------"
+                widths = [max(len(name), 10) for _, name in columns]
+                header = " | ".join(
+                    f"{name:<{width}}" for (_, name), width in zip(columns, widths)
                 )
+                print(f"   Month   | {header} | Total")
+                print(f"   --------|-{'-|-'.join('-' * w for w in widths)}-|--------")
                 for row in results:
-                    print(
-                        f"   {row['month']} | ${row['Electronics']:9.2f} | ${row['Clothing']:6.2f} | ${row['Books']:5.2f} | ${row['Sports']:5.2f} | ${row['Home_Garden']:9.2f} | ${row['Total']:6.2f}"
+                    cells = " | ".join(
+                        f"${row[f'cat_{cid}']:>{width - 1}}"
+                        for (cid, _), width in zip(columns, widths)
                     )
+                    print(f"   {row['month']} | {cells} | ${row['Total']:>6}")
         except Exception as e:
             print(f"   Error: {e}")
 
+    def _pivot_categories(self) -> List[Dict[str, Any]]:
+        """Return the pivot's category columns."""
+        assert self.db is not None
+        return (
+            self.db.execute_query(
+                "SELECT category_id, category_name FROM categories "
+                "ORDER BY category_id"
+            )
+            or []
+        )
+
 
 def main():
     """Run advanced queries demonstrations."""
     print("MySQL Advanced Queries Examples")
     print("=" * 40)
 
-    queries = AdvancedQueries()
-
     try:
-        if not queries.setup():
+        pool = create_connection_pool("advanced_queries", len(DEMO_METHODS))
+        if not pool:
             print("Failed to connect to database. Please check your configuration.")
             return
 
-        queries.complex_joins_demo()
-        queries.subqueries_demo()
-        queries.window_functions_demo()
-        queries.analytical_queries_demo()
-        queries.pivot_like_queries_demo()
+        # The demos are independent reads, so overlap their network waits and
+        # print each demo's captured output in the original order.
+        run_concurrently(pool, AdvancedQueries, DEMO_METHODS)
 
     except Exception as e:
         print(f"Error: {e}")
@@ -396,9 +433,6 @@ def main():
         print("3. Sample data loaded")
         print("4. .env file configured")
 
-    finally:
-        queries.cleanup()
-
 
 if __name__ == "__main__":
     main()
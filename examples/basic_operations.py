@@ -6,7 +6,9 @@ This module demonstrates basic CRUD operations using Python and MySQL.
 import os
 import sys
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Standalone script runs need the project root on sys.path.
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.database import MySQLConnection
 
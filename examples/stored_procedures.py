@@ -7,10 +7,55 @@ import os
 import sys
 from typing import Optional
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Standalone script runs need the project root on sys.path.
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.database import MySQLConnection
 
+# Triggers that keep the mv_customer_orders summary table up to date
+MV_TRIGGERS = (
+    "mv_co_order_insert",
+    "mv_co_order_update",
+    "mv_co_order_delete",
+    "mv_co_item_insert",
+    "mv_co_item_update",
+    "mv_co_item_delete",
+)
+
+
+# Calculated and actual totals for the first orders, compared server-side
+ORDER_TOTALS_SQL = """
+SELECT
+    o.order_id,
+    o.total_amount AS actual_total,
+    COALESCE(SUM(oi.total_price), 0.00) AS calculated_total,
+    ABS(o.total_amount - COALESCE(SUM(oi.total_price), 0.00)) < 0.01 AS totals_match
+FROM (SELECT order_id, total_amount FROM orders LIMIT 3) o
+LEFT JOIN order_items oi ON o.order_id = oi.order_id
+GROUP BY o.order_id, o.total_amount
+ORDER BY o.order_id
+"""
+
+# One INFORMATION_SCHEMA scan covering routines and parameters; a function's
+# return value comes back as an unnamed row with no PARAMETER_MODE
+ROUTINE_INFO_SQL = """
+SELECT
+    r.ROUTINE_TYPE,
+    r.ROUTINE_NAME,
+    r.CREATED,
+    r.ROUTINE_COMMENT,
+    p.PARAMETER_NAME,
+    p.PARAMETER_MODE,
+    p.DATA_TYPE
+FROM INFORMATION_SCHEMA.ROUTINES r
+LEFT JOIN INFORMATION_SCHEMA.PARAMETERS p
+    ON p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA
+    AND p.SPECIFIC_NAME = r.SPECIFIC_NAME
+WHERE r.ROUTINE_SCHEMA = DATABASE()
+ORDER BY r.ROUTINE_TYPE, r.ROUTINE_NAME, p.ORDINAL_POSITION
+"""
+
 
 class StoredProcedureExamples:
     """MySQL stored procedures demonstrations."""
@@ -19,18 +64,17 @@ class StoredProcedureExamples:
         self.db: Optional[MySQLConnection] = None
 
     def setup(self) -> bool:
-        """Setup database connection."""
+        """Setup database connection (shared by every instance in the process)."""
         try:
-            self.db = MySQLConnection()
-            return self.db.connect()
+            self.db = MySQLConnection.shared()
+            return self.db.connection is not None
         except Exception as e:
             print(f"Failed to setup database connection: {e}")
             return False
 
     def cleanup(self):
-        """Clean up database connection."""
-        if self.db:
-            self.db.disconnect()
+        """Release the shared connection; it is closed at interpreter exit."""
+        self.db = None
 
     def _check_connection(self) -> bool:
         """Check if database connection is available."""
@@ -54,43 +98,32 @@ class StoredProcedureExamples:
             "DROP PROCEDURE IF EXISTS GetProductsByCategory",
             "DROP FUNCTION IF EXISTS CalculateOrderTotal",
             "DROP TRIGGER IF EXISTS update_order_total",
-        ]
+        ] + [f"DROP TRIGGER IF EXISTS {name}" for name in MV_TRIGGERS]
 
-        for drop_sql in drop_procedures:
-            try:
-                self.db.execute_update(drop_sql)
-            except Exception:
-                pass  # Ignore if doesn't exist
+        # Every DROP uses IF EXISTS, so a failure here is a real error
+        dropped = self.db.execute_script(";\n".join(drop_procedures))
+        if len(dropped) < len(drop_procedures):
+            print("   ✗ Could not drop the existing routines")
 
-        print("\n1. Creating procedure: GetCustomerOrders")
+        mv_created = self._create_customer_orders_mv()
 
-        # Procedure 1: Get customer orders
+        # Procedure 1: Get customer orders (from the pre-aggregated summary)
         create_proc1 = """
         CREATE PROCEDURE GetCustomerOrders(IN customer_email VARCHAR(100))
         BEGIN
             SELECT 
-                o.order_id,
-                o.order_date,
-                o.status,
-                o.total_amount,
-                COUNT(oi.order_item_id) as item_count
+                mv.order_id,
+                mv.order_date,
+                mv.status,
+                mv.total_amount,
+                mv.item_count
             FROM customers c
-            JOIN orders o ON c.customer_id = o.customer_id
-            LEFT JOIN order_items oi ON o.order_id = oi.order_id
+            JOIN mv_customer_orders mv ON c.customer_id = mv.customer_id
             WHERE c.email = customer_email
-            GROUP BY o.order_id, o.order_date, o.status, o.total_amount
-            ORDER BY o.order_date DESC;
+            ORDER BY mv.order_date DESC;
         END
         """
 
-        try:
-            self.db.execute_update(create_proc1)
-            print("   ✓ GetCustomerOrders procedure created")
-        except Exception as e:
-            print(f"   ✗ Error creating GetCustomerOrders: {e}")
-
-        print("\n2. Creating procedure: UpdateProductStock")
-
         # Procedure 2: Update product stock
         create_proc2 = """
         CREATE PROCEDURE UpdateProductStock(
@@ -100,45 +133,32 @@ class StoredProcedureExamples:
             OUT p_result VARCHAR(100)
         )
         BEGIN
+            DECLARE product_found INT DEFAULT 0;
             DECLARE current_stock INT DEFAULT 0;
-            DECLARE product_count INT DEFAULT 0;
             
-            -- Check if product exists
-            SELECT COUNT(*) INTO product_count FROM products WHERE sku = p_sku;
+            -- FOR UPDATE locks the row, so concurrent callers cannot both pass
+            -- the stock check below with the same stale value
+            SELECT 1, stock_quantity INTO product_found, current_stock
+            FROM products WHERE sku = p_sku FOR UPDATE;
             
-            IF product_count = 0 THEN
+            IF product_found = 0 THEN
                 SET p_result = 'Product not found';
                 SET p_new_stock = -1;
+            ELSEIF (current_stock + p_quantity_change) < 0 THEN
+                SET p_result = 'Insufficient stock';
+                SET p_new_stock = current_stock;
             ELSE
-                -- Get current stock
-                SELECT stock_quantity INTO current_stock FROM products WHERE sku = p_sku;
+                UPDATE products 
+                SET stock_quantity = stock_quantity + p_quantity_change 
+                WHERE sku = p_sku;
                 
-                -- Check if we have enough stock for reduction
-                IF (current_stock + p_quantity_change) < 0 THEN
-                    SET p_result = 'Insufficient stock';
-                    SET p_new_stock = current_stock;
-                ELSE
-                    -- Update stock
-                    UPDATE products 
-                    SET stock_quantity = stock_quantity + p_quantity_change 
-                    WHERE sku = p_sku;
-                    
-                    -- Get new stock level
-                    SELECT stock_quantity INTO p_new_stock FROM products WHERE sku = p_sku;
-                    SET p_result = 'Stock updated successfully';
-                END IF;
+                -- The row is still locked, so no re-read is needed
+                SET p_new_stock = current_stock + p_quantity_change;
+                SET p_result = 'Stock updated successfully';
             END IF;
         END
         """
 
-        try:
-            self.db.execute_update(create_proc2)
-            print("   ✓ UpdateProductStock procedure created")
-        except Exception as e:
-            print(f"   ✗ Error creating UpdateProductStock: {e}")
-
-        print("\n3. Creating procedure: GetProductsByCategory")
-
         # Procedure 3: Get products by category with pagination
         create_proc3 = """
         CREATE PROCEDURE GetProductsByCategory(
@@ -162,11 +182,118 @@ class StoredProcedureExamples:
         END
         """
 
-        try:
-            self.db.execute_update(create_proc3)
-            print("   ✓ GetProductsByCategory procedure created")
-        except Exception as e:
-            print(f"   ✗ Error creating GetProductsByCategory: {e}")
+        procedures = [
+            ("GetCustomerOrders", create_proc1),
+            ("UpdateProductStock", create_proc2),
+            ("GetProductsByCategory", create_proc3),
+        ]
+        for number, (name, create_proc) in enumerate(procedures, start=1):
+            print(f"\n{number}. Creating procedure: {name}")
+            if name == "GetCustomerOrders" and not mv_created:
+                print(f"   ✗ Skipped {name}: mv_customer_orders was not built")
+                continue
+            # execute_update reports its own errors; last_error tells us if it failed
+            error_before = self.db.last_error
+            self.db.execute_update(create_proc)
+            if self.db.last_error is error_before:
+                print(f"   ✓ {name} procedure created")
+            else:
+                print(f"   ✗ Error creating {name}: {self.db.last_error}")
+
+    def _create_customer_orders_mv(self) -> bool:
+        """Create and fill mv_customer_orders; triggers keep it current."""
+        assert self.db is not None
+
+        print("\n0. Creating summary table: mv_customer_orders")
+
+        create_table = """
+        CREATE TABLE IF NOT EXISTS mv_customer_orders (
+            order_id INT PRIMARY KEY,
+            customer_id INT NOT NULL,
+            order_date TIMESTAMP NULL,
+            status VARCHAR(20),
+            total_amount DECIMAL(10, 2) NOT NULL,
+            item_count INT NOT NULL DEFAULT 0,
+            INDEX idx_mv_customer (customer_id, order_date)
+        )
+        """
+
+        # One trigger per change that affects a summary row
+        create_triggers = [
+            """
+            CREATE TRIGGER mv_co_order_insert AFTER INSERT ON orders
+            FOR EACH ROW
+                INSERT INTO mv_customer_orders
+                    (order_id, customer_id, order_date, status, total_amount)
+                VALUES (NEW.order_id, NEW.customer_id, NEW.order_date,
+                        NEW.status, NEW.total_amount)
+            """,
+            """
+            CREATE TRIGGER mv_co_order_update AFTER UPDATE ON orders
+            FOR EACH ROW
+                UPDATE mv_customer_orders
+                SET customer_id = NEW.customer_id, order_date = NEW.order_date,
+                    status = NEW.status, total_amount = NEW.total_amount
+                WHERE order_id = NEW.order_id
+            """,
+            """
+            CREATE TRIGGER mv_co_order_delete AFTER DELETE ON orders
+            FOR EACH ROW
+                DELETE FROM mv_customer_orders WHERE order_id = OLD.order_id
+            """,
+            """
+            CREATE TRIGGER mv_co_item_insert AFTER INSERT ON order_items
+            FOR EACH ROW
+                UPDATE mv_customer_orders SET item_count = item_count + 1
+                WHERE order_id = NEW.order_id
+            """,
+            """
+            CREATE TRIGGER mv_co_item_update AFTER UPDATE ON order_items
+            FOR EACH ROW
+            BEGIN
+                UPDATE mv_customer_orders SET item_count = item_count - 1
+                WHERE order_id = OLD.order_id;
+                UPDATE mv_customer_orders SET item_count = item_count + 1
+                WHERE order_id = NEW.order_id;
+            END
+            """,
+            """
+            CREATE TRIGGER mv_co_item_delete AFTER DELETE ON order_items
+            FOR EACH ROW
+                UPDATE mv_customer_orders SET item_count = item_count - 1
+                WHERE order_id = OLD.order_id
+            """,
+        ]
+
+        # Full refresh; from here on the triggers keep it current
+        refresh = """
+        INSERT INTO mv_customer_orders
+            (order_id, customer_id, order_date, status, total_amount, item_count)
+        SELECT
+            o.order_id,
+            o.customer_id,
+            o.order_date,
+            o.status,
+            o.total_amount,
+            COUNT(oi.order_item_id)
+        FROM orders o
+        LEFT JOIN order_items oi ON o.order_id = oi.order_id
+        GROUP BY o.order_id, o.customer_id, o.order_date, o.status, o.total_amount
+        """
+
+        steps = [create_table, *create_triggers, "DELETE FROM mv_customer_orders"]
+        for statement in steps + [refresh]:
+            # execute_update reports its own errors; last_error tells us if it failed
+            error_before = self.db.last_error
+            rows = self.db.execute_update(statement)
+            if self.db.last_error is not error_before:
+                print(f"   ✗ Error creating mv_customer_orders: {self.db.last_error}")
+                # Triggers over a missing or stale table would break order writes
+                drops = [f"DROP TRIGGER IF EXISTS {name}" for name in MV_TRIGGERS]
+                self.db.execute_script(";".join(drops))
+                return False
+        print(f"   ✓ mv_customer_orders populated with {rows} order(s)")
+        return True
 
     def create_functions_demo(self):
         """Create sample functions."""
@@ -212,34 +339,19 @@ class StoredProcedureExamples:
         print("\n1. Calling GetCustomerOrders for John Doe:")
 
         try:
-            # Use a direct query instead of CALL to avoid multi-statement issues
-            query = """
-            SELECT 
-                o.order_id,
-                o.order_date,
-                o.status,
-                o.total_amount,
-                COUNT(oi.order_item_id) as item_count
-            FROM customers c
-            JOIN orders o ON c.customer_id = o.customer_id
-            LEFT JOIN order_items oi ON o.order_id = oi.order_id
-            WHERE c.email = %s
-            GROUP BY o.order_id, o.order_date, o.status, o.total_amount
-            ORDER BY o.order_date DESC
-            """
-
-            results = self.db.execute_query(query, ("john.doe@email.com",))
-            if results:
+            results = self.db.call_procedure_results(
+                "GetCustomerOrders", ("john.doe@email.com",)
+            )
+            orders = results[0] if results else []
+            if orders:
                 print("   Orders found:")
-                for order in results:
-                    print(
-                        f"   - Order #{order['order_id']}: ${order['total_amount']:.2f}"
-                    )
-                    print(
-                        f"     Date: {order['order_date']}, Status: {order['status']}"
-                    )
-                    print(f"     Items: {order['item_count']}")
-                    print()
+                # One template for every row, one write per order instead of four prints
+                write_order = (
+                    "   - Order #{order_id}: ${total_amount:.2f}\n"
+                    "     Date: {order_date}, Status: {status}\n"
+                    "     Items: {item_count}\n\n"
+                ).format_map
+                sys.stdout.writelines(map(write_order, orders))
             else:
                 print("   No orders found")
         except Exception as e:
@@ -248,88 +360,72 @@ class StoredProcedureExamples:
         print("\n2. Calling GetProductsByCategory for Electronics:")
 
         try:
-            # Use a direct query instead of CALL
-            query = """
-            SELECT 
-                p.product_id,
-                p.product_name,
-                p.price,
-                p.stock_quantity,
-                p.sku,
-                c.category_name
-            FROM products p
-            JOIN categories c ON p.category_id = c.category_id
-            WHERE c.category_name = %s
-            ORDER BY p.product_name
-            LIMIT %s OFFSET %s
-            """
-
-            results = self.db.execute_query(query, ("Electronics", 5, 0))
-            if results:
+            results = self.db.call_procedure_results(
+                "GetProductsByCategory", ("Electronics", 5, 0)
+            )
+            products = results[0] if results else []
+            if products:
                 print("   Electronics products:")
-                for product in results:
-                    print(f"   - {product['product_name']}: ${product['price']:.2f}")
-                    print(
-                        f"     SKU: {product['sku']}, Stock: {product['stock_quantity']}"
-                    )
-                    print()
+                write_product = (
+                    "   - {product_name}: ${price:.2f}\n"
+                    "     SKU: {sku}, Stock: {stock_quantity}\n\n"
+                ).format_map
+                sys.stdout.writelines(map(write_product, products))
             else:
                 print("   No products found")
         except Exception as e:
             print(f"   ✗ Error calling procedure: {e}")
 
     def procedure_with_output_demo(self):
-        """Demonstrate procedures with output parameters - simplified approach."""
+        """Demonstrate procedures with output parameters."""
         print("\n=== Procedures with Output Parameters ===")
 
         if not self._check_connection():
             return
         assert self.db is not None
 
-        print("\n1. Testing stock updates (simulating UpdateProductStock procedure):")
+        print("\n1. Testing stock updates (calling UpdateProductStock procedure):")
 
-        # Test cases - we'll simulate the procedure logic directly
         test_cases = [
             ("ELEC-001", 10, "Adding 10 units"),
             ("ELEC-001", -5, "Removing 5 units"),
             ("INVALID-SKU", 10, "Invalid product"),
         ]
 
-        for sku, quantity_change, description in test_cases:
-            print(f"\n   {description} for {sku}:")
+        # All the CALLs go out in one round trip; each leaves its OUT values in
+        # session variables, which one SELECT then reads back
+        calls = ";\n".join(
+            f"CALL UpdateProductStock(%s, %s, @new_stock_{i}, @result_{i})"
+            for i in range(len(test_cases))
+        )
+        call_params = tuple(
+            value
+            for sku, quantity_change, _ in test_cases
+            for value in (sku, quantity_change)
+        )
+        outputs = ", ".join(
+            f"@new_stock_{i}, @result_{i}" for i in range(len(test_cases))
+        )
 
-            try:
-                # Check if product exists
-                check_query = "SELECT stock_quantity FROM products WHERE sku = %s"
-                result = self.db.execute_query(check_query, (sku,))
-
-                if not result:
-                    print(f"     Result: Product not found")
-                else:
-                    current_stock = result[0]["stock_quantity"]
-                    new_stock = current_stock + quantity_change
-
-                    if new_stock < 0:
-                        print(
-                            f"     Result: Insufficient stock (current: {current_stock})"
-                        )
-                    else:
-                        # Update stock
-                        update_query = (
-                            "UPDATE products SET stock_quantity = %s WHERE sku = %s"
-                        )
-                        rows_affected = self.db.execute_update(
-                            update_query, (new_stock, sku)
-                        )
-
-                        if rows_affected > 0:
-                            print(f"     Result: Stock updated successfully")
-                            print(f"     New Stock: {new_stock}")
-                        else:
-                            print(f"     Result: Update failed")
-
-            except Exception as e:
-                print(f"     ✗ Error: {e}")
+        try:
+            # One transaction (and one COMMIT) for all the stock changes
+            with self.db.transaction():
+                executed = self.db.execute_script(calls, call_params)
+                result = self.db.execute_query_tuple(f"SELECT {outputs}")
+        except Exception as e:
+            print(f"   ✗ Error: {e}")
+            return
+
+        row = result[1][0] if result and executed else None
+        for i, (sku, _, description) in enumerate(test_cases):
+            print(f"\n   {description} for {sku}:")
+            if row:
+                new_stock, message = row[2 * i], row[2 * i + 1]
+                print(f"     Result: {message}")
+                if new_stock >= 0:
+                    print(f"     New Stock: {new_stock}")
+            else:
+                print("     Result: Procedure call failed")
 
     def functions_demo(self):
         """Demonstrate using functions - simplified approach."""
@@ -344,45 +440,21 @@ class StoredProcedureExamples:
         )
 
         try:
-            # Get some order IDs first
-            orders_query = "SELECT order_id FROM orders LIMIT 3"
-            orders = self.db.execute_query(orders_query)
+            # Plain tuple rows, unpacked in SELECT order (no per-row dict)
+            result = self.db.execute_query_tuple(ORDER_TOTALS_SQL, prepared=True)
+            orders = result[1] if result else []
 
             if orders:
-                for order in orders:
-                    order_id = order["order_id"]
-
-                    # Calculate total using direct query (simulating function)
-                    calc_query = """
-                    SELECT COALESCE(SUM(total_price), 0.00) as calculated_total
-                    FROM order_items
-                    WHERE order_id = %s
-                    """
-                    result = self.db.execute_query(calc_query, (order_id,))
-
-                    if result:
-                        calculated_total = result[0]["calculated_total"]
-
-                        # Compare with actual order total
-                        actual_query = (
-                            "SELECT total_amount FROM orders WHERE order_id = %s"
-                        )
-                        actual_result = self.db.execute_query(actual_query, (order_id,))
-
-                        if actual_result:
-                            actual_total = actual_result[0]["total_amount"]
-                            print(f"   Order #{order_id}:")
-                            print(f"     Calculated total: ${calculated_total:.2f}")
-                            print(f"     Actual total: ${actual_total:.2f}")
-
-                            if (
-                                abs(float(calculated_total) - float(actual_total))
-                                < 0.01
-                            ):
-                                print("     ✓ Totals match")
-                            else:
-                                print("     ✗ Totals don't match")
-                            print()
+                for order_id, actual_total, calculated_total, totals_match in orders:
+                    print(f"   Order #{order_id}:")
+                    print(f"     Calculated total: ${calculated_total:.2f}")
+                    print(f"     Actual total: ${actual_total:.2f}")
+
+                    if totals_match:
+                        print("     ✓ Totals match")
+                    else:
+                        print("     ✗ Totals don't match")
+                    print()
             else:
                 print("   No orders found")
 
@@ -397,77 +469,40 @@ class StoredProcedureExamples:
             return
         assert self.db is not None
 
-        print("\n1. List of stored procedures:")
+        print("\n1. Stored procedures, functions and their parameters:")
 
         try:
-            procedures_query = """
-            SELECT 
-                ROUTINE_NAME,
-                ROUTINE_TYPE,
-                CREATED,
-                LAST_ALTERED,
-                SQL_MODE,
-                ROUTINE_COMMENT
-            FROM INFORMATION_SCHEMA.ROUTINES
-            WHERE ROUTINE_SCHEMA = DATABASE()
-            ORDER BY ROUTINE_TYPE, ROUTINE_NAME
-            """
-
-            procedures = self.db.execute_query(procedures_query)
-            if procedures:
-                current_type = ""
-                for proc in procedures:
-                    routine_type = proc.get("ROUTINE_TYPE", "UNKNOWN")
-                    routine_name = proc.get("ROUTINE_NAME", "UNKNOWN")
-                    created = proc.get("CREATED", "UNKNOWN")
-                    comment = proc.get("ROUTINE_COMMENT", "")
-
-                    if routine_type != current_type:
-                        current_type = routine_type
-                        print(f"\n   {current_type}S:")
-
-                    print(f"   - {routine_name}")
-                    print(f"     Created: {created}")
+            # Rows are printed as they stream in, never held in a list
+            rows = self.db.execute_query_stream(ROUTINE_INFO_SQL, prepared=True)
+            current_type = ""
+            current_routine = ""
+            for (
+                routine_type,
+                routine_name,
+                created,
+                comment,
+                param_name,
+                param_mode,
+                data_type,
+            ) in rows:
+                if routine_type != current_type:
+                    current_type = routine_type
+                    print(f"\n   {current_type}S:")
+
+                if routine_name != current_routine:
+                    current_routine = routine_name
+                    lines = [f"   - {routine_name}\n", f"     Created: {created}\n"]
                     if comment:
-                        print(f"     Comment: {comment}")
-            else:
-                print("   No procedures or functions found")
-
-        except Exception as e:
-            print(f"   ✗ Error: {e}")
-
-        print("\n2. Procedure parameters:")
-
-        try:
-            params_query = """
-            SELECT 
-                SPECIFIC_NAME,
-                PARAMETER_NAME,
-                PARAMETER_MODE,
-                DATA_TYPE
-            FROM INFORMATION_SCHEMA.PARAMETERS
-            WHERE SPECIFIC_SCHEMA = DATABASE()
-            AND PARAMETER_NAME IS NOT NULL
-            ORDER BY SPECIFIC_NAME, ORDINAL_POSITION
-            """
-
-            params = self.db.execute_query(params_query)
-            if params:
-                current_proc = ""
-                for param in params:
-                    specific_name = param.get("SPECIFIC_NAME", "UNKNOWN")
-                    param_name = param.get("PARAMETER_NAME", "UNKNOWN")
-                    param_mode = param.get("PARAMETER_MODE", "UNKNOWN")
-                    data_type = param.get("DATA_TYPE", "UNKNOWN")
-
-                    if specific_name != current_proc:
-                        current_proc = specific_name
-                        print(f"\n   {current_proc}:")
+                        lines.append(f"     Comment: {comment}\n")
+                    sys.stdout.writelines(lines)
 
+                # data_type is NULL only on a parameterless procedure's row
+                if data_type:
                     mode = param_mode or "RETURN"
-                    print(f"     {mode} {param_name}: {data_type}")
-            else:
-                print("   No parameters found")
+                    print(f"       {mode} {param_name or 'value'}: {data_type}")
+
+            if not current_routine:
+                print("   No procedures or functions found")
 
         except Exception as e:
             print(f"   ✗ Error: {e}")
@@ -487,15 +522,13 @@ class StoredProcedureExamples:
             "DROP PROCEDURE IF EXISTS UpdateProductStock",
             "DROP PROCEDURE IF EXISTS GetProductsByCategory",
             "DROP FUNCTION IF EXISTS CalculateOrderTotal",
-        ]
+        ] + [f"DROP TRIGGER IF EXISTS {name}" for name in MV_TRIGGERS]
+        cleanup_statements.append("DROP TABLE IF EXISTS mv_customer_orders")
 
-        for statement in cleanup_statements:
-            try:
-                self.db.execute_update(statement)
-                routine_name = statement.split()[-1]
-                print(f"   ✓ Dropped {routine_name}")
-            except Exception as e:
-                print(f"   ✗ Error dropping routine: {e}")
+        # One round trip; the results come back per statement
+        for statement, _ in self.db.execute_script(";".join(cleanup_statements)):
+            routine_name = statement.split()[-1]
+            print(f"   ✓ Dropped {routine_name}")
 
 
 def main():
@@ -521,6 +554,7 @@ def main():
         print("\n" + "=" * 37)
         print("Note: Procedures and functions have been created in your database.")
         print("They will remain available for future use.")
+        print("Triggers on orders and order_items keep mv_customer_orders current.")
         print("Uncomment the line below if you want to clean them up:")
         print("# examples.cleanup_procedures_demo()")
 
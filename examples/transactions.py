@@ -3,14 +3,135 @@ MySQL Transactions Examples
 Demonstrates transaction handling, ACID properties, and error recovery.
 """
 
+import functools
+import io
 import os
+import random
 import sys
-from typing import Optional
+import time
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Standalone script runs need the project root on sys.path.
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-from config.database import MySQLConnection
+from mysql.connector import errorcode, pooling
+
+from config.database import DatabaseConfig, MySQLConnection, create_connection_pool
+
+# Shared by every TransactionExamples instance, created on first setup()
+_pool: Optional[pooling.MySQLConnectionPool] = None
+
+
+# Whether the server has performance_schema enabled; probed once per process
+_has_perf_schema: Optional[bool] = None
+
+
+def _get_pool() -> Optional[pooling.MySQLConnectionPool]:
+    """Return the module's connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        # No session reset on return: every checkout sets what it needs
+        _pool = create_connection_pool("transactions", 2, reset_session=False)
+    return _pool
+
+
+# The server rolled the transaction back; running it again may succeed
+LOCK_CONFLICT_ERRNOS = (errorcode.ER_LOCK_DEADLOCK, errorcode.ER_LOCK_WAIT_TIMEOUT)
+
+T = TypeVar("T")
+
+# Transaction-related counters shown by performance_monitoring_demo
+STATUS_VARIABLES = (
+    "Questions",
+    "Com_commit",
+    "Com_rollback",
+    "Innodb_rows_read",
+    "Innodb_rows_inserted",
+    "Innodb_rows_updated",
+    "Innodb_rows_deleted",
+)
+
+_STATUS_PLACEHOLDERS = ", ".join(["%s"] * len(STATUS_VARIABLES))
+GLOBAL_STATUS_SQL = (
+    "SELECT VARIABLE_NAME AS Variable_name, VARIABLE_VALUE AS Value"
+    " FROM performance_schema.global_status"
+    f" WHERE VARIABLE_NAME IN ({_STATUS_PLACEHOLDERS})"
+)
+# Same filter for servers without performance_schema
+SHOW_STATUS_SQL = f"SHOW GLOBAL STATUS WHERE Variable_name IN ({_STATUS_PLACEHOLDERS})"
+
+PERF_SCHEMA_SQL = "SELECT @@performance_schema AS enabled"
+
+SESSION_SETTINGS_SQL = (
+    "SELECT @@transaction_isolation AS isolation_level,"
+    " @@autocommit AS autocommit_status,"
+    " @@transaction_read_only AS read_only"
+)
+
+# Current locks; only the printed columns, filtered on the configured schema
+# name rather than DATABASE()
+METADATA_LOCKS_SQL = """
+SELECT OBJECT_NAME, LOCK_TYPE, LOCK_MODE
+FROM performance_schema.metadata_locks
+WHERE OBJECT_SCHEMA = %s
+LIMIT 5
+"""
+
+# Taking the stock checks availability and locks the product row; the order
+# total is then priced from that row on the server
+TAKE_STOCK_SQL = """
+UPDATE products SET stock_quantity = stock_quantity - %s
+WHERE sku = %s AND stock_quantity >= %s
+"""
+CREATE_ORDER_SQL = """
+INSERT INTO orders (customer_id, order_date, status, total_amount)
+SELECT %s, NOW(), 'processing', price * %s
+FROM products WHERE sku = %s
+"""
+# Read back inside the transaction, while the product row is still locked
+ORDER_SUMMARY_SQL = """
+SELECT o.order_id, o.total_amount, p.product_name, p.stock_quantity
+FROM orders o
+JOIN products p ON p.sku = %s
+WHERE o.order_id = %s
+"""
+
+DEADLOCK_TIPS = (
+    "- Always acquire locks in the same order",
+    "- Keep transactions short",
+    "- Use appropriate isolation levels",
+    "- Handle deadlock exceptions gracefully",
+    "- Consider using SELECT FOR UPDATE for explicit locking",
+)
+
+OPTIMIZATION_TIPS = (
+    "- Use indexes on frequently queried columns",
+    "- Avoid long-running transactions",
+    "- Batch multiple operations when possible",
+    "- Monitor slow query log",
+    "- Use EXPLAIN to analyze query performance",
+    "- Consider connection pooling for high-load applications",
+)
+
+
+def _buffered_output(method):
+    """Collect a demo's output and write it in one call (unless stdout is a TTY)."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if sys.stdout.isatty():
+            return method(*args, **kwargs)
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                return method(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+
+    return wrapper
 
 
 class TransactionExamples:
@@ -18,21 +139,55 @@ class TransactionExamples:
 
     def __init__(self):
         self.db: Optional[MySQLConnection] = None
+        # Session isolation level, autocommit and read-only, read once per connection
+        self._session_vars: Optional[Dict[str, Any]] = None
 
     def setup(self) -> bool:
-        """Setup database connection."""
+        """Check a connection out of the pool (a direct one if pooling fails)."""
+        self._session_vars = None
         try:
-            self.db = MySQLConnection()
+            # Short single-row transactions need no gap locks; READ COMMITTED
+            # is set once for the session instead of per transaction
+            self.db = MySQLConnection(
+                pool=_get_pool(), isolation_level="READ COMMITTED"
+            )
             return self.db.connect()
         except Exception as e:
             print(f"Failed to setup database connection: {e}")
             return False
 
     def cleanup(self):
-        """Clean up database connection."""
+        """Return the connection to the pool."""
         if self.db:
             self.db.disconnect()
 
+    def _perf_schema_enabled(self) -> bool:
+        """Return whether performance_schema is enabled, probing only once."""
+        global _has_perf_schema
+        if _has_perf_schema is None:
+            assert self.db is not None
+            row = self.db.execute_query_one(PERF_SCHEMA_SQL)
+            if row is None:
+                return False
+            _has_perf_schema = bool(row["enabled"])
+        return _has_perf_schema
+
+    def _with_lock_retry(self, attempt: Callable[[], T], attempts: int = 3) -> T:
+        """Run attempt(), retrying with backoff if it lost a deadlock or lock wait."""
+        assert self.db is not None
+        for n in range(attempts - 1):
+            self.db.last_error = None
+            try:
+                return attempt()
+            except RuntimeError:
+                errno = getattr(self.db.last_error, "errno", None)
+                if errno not in LOCK_CONFLICT_ERRNOS:
+                    raise
+            print("   Lock conflict, retrying...")
+            time.sleep(0.01 * 2**n + random.random() * 0.01)
+        self.db.last_error = None
+        return attempt()
+
     def _check_connection(self) -> bool:
         """Check if database connection is available."""
         if not self.db or not self.db.connection:
@@ -40,8 +195,9 @@ class TransactionExamples:
             return False
         return True
 
+    @_buffered_output
     def basic_transaction_demo(self):
-        """Demonstrate basic transaction operations using execute_update."""
+        """Demonstrate basic transaction operations in one explicit transaction."""
         print("=== Basic Transaction Demo ===")
 
         if not self._check_connection():
@@ -50,48 +206,64 @@ class TransactionExamples:
 
         print("\n1. Stock transfer with transaction safety:")
 
-        # Get current stock levels first
-        stock_query = "SELECT product_name, stock_quantity FROM products WHERE sku IN ('ELEC-001', 'ELEC-002') LIMIT 2"
-        initial_stock = self.db.execute_query(stock_query)
-
-        if initial_stock and len(initial_stock) >= 2:
-            product1, product2 = initial_stock[0], initial_stock[1]
-            print(
-                f"   Before: {product1['product_name']}: {product1['stock_quantity']}"
-            )
-            print(
-                f"   Before: {product2['product_name']}: {product2['stock_quantity']}"
-            )
-
-            # Simulate stock transfer - reduce from one, add to another
-            transfer_amount = 5
+        # Simulate stock transfer - reduce from one, add to another
+        transfer_amount = 5
+        # Sorted by sku so concurrent transfers always lock rows in the same order
+        transfers = sorted(
+            [(-transfer_amount, "ELEC-001"), (transfer_amount, "ELEC-002")],
+            key=lambda transfer: transfer[1],
+        )
+        skus = tuple(sku for _, sku in transfers)
+        placeholders = ", ".join(["%s"] * len(skus))
+
+        # One IN-list read locks every row up front, so Before/After are exact
+        stock_query = (
+            "SELECT sku, product_name, stock_quantity FROM products"
+            f" WHERE sku IN ({placeholders}) ORDER BY sku FOR UPDATE"
+        )
+        # Both stock changes are one UPDATE (a CASE per sku)
+        transfer_query = (
+            "UPDATE products SET stock_quantity = stock_quantity + CASE sku "
+            + " ".join("WHEN %s THEN %s" for _ in transfers)
+            + f" END WHERE sku IN ({placeholders})"
+        )
+        transfer_params = (
+            tuple(value for delta, sku in transfers for value in (sku, delta)) + skus
+        )
+
+        def attempt() -> List[Dict[str, Any]]:
+            # Committed once; READ COMMITTED locks just these rows, no gap locks
+            assert self.db is not None
+            with self.db.transaction():
+                initial_stock = self.db.execute_query_prepared(stock_query, skus)
+                if not initial_stock or len(initial_stock) < len(skus):
+                    raise RuntimeError("products not found")
+                for product in initial_stock:
+                    print(
+                        f"   Before: {product['product_name']}: {product['stock_quantity']}"
+                    )
 
-            # In a real transaction, these would be wrapped in START TRANSACTION / COMMIT
-            print(f"   Transferring {transfer_amount} units...")
+                print(f"   Transferring {transfer_amount} units...")
+                rows = self.db.execute_update_prepared(transfer_query, transfer_params)
+                if rows != len(transfers):
+                    raise RuntimeError("not every product was updated")
+            return initial_stock
 
-            # Update stocks (the MySQLConnection class handles transaction-like behavior)
-            update1 = "UPDATE products SET stock_quantity = stock_quantity - %s WHERE sku = 'ELEC-001'"
-            rows1 = self.db.execute_update(update1, (transfer_amount,))
+        try:
+            initial_stock = self._with_lock_retry(attempt)
+        except Exception as e:
+            print(f"   ✗ Transfer failed, rolled back: {e}")
+            return
 
-            update2 = "UPDATE products SET stock_quantity = stock_quantity + %s WHERE sku = 'ELEC-002'"
-            rows2 = self.db.execute_update(update2, (transfer_amount,))
+        print("   ✓ Transfer completed successfully")
 
-            if rows1 > 0 and rows2 > 0:
-                print("   ✓ Transfer completed successfully")
-
-                # Show final stock levels
-                final_stock = self.db.execute_query(stock_query)
-                if final_stock and len(final_stock) >= 2:
-                    product1, product2 = final_stock[0], final_stock[1]
-                    print(
-                        f"   After: {product1['product_name']}: {product1['stock_quantity']}"
-                    )
-                    print(
-                        f"   After: {product2['product_name']}: {product2['stock_quantity']}"
-                    )
-            else:
-                print("   ✗ Transfer failed")
+        # The deltas are known, so the new levels need no second SELECT
+        deltas = {sku: delta for delta, sku in transfers}
+        for product in initial_stock:
+            new_stock = product["stock_quantity"] + deltas[product["sku"]]
+            print(f"   After: {product['product_name']}: {new_stock}")
 
+    @_buffered_output
     def transaction_isolation_demo(self):
         """Demonstrate transaction isolation concepts."""
         print("\n=== Transaction Isolation Demo ===")
@@ -103,21 +275,23 @@ class TransactionExamples:
         print("\n1. Current transaction settings:")
 
         try:
-            # Show current isolation level
-            isolation_query = "SELECT @@transaction_isolation as isolation_level"
-            result = self.db.execute_query(isolation_query)
-            if result:
-                print(f"   Current isolation level: {result[0]['isolation_level']}")
-
-            # Show autocommit status
-            autocommit_query = "SELECT @@autocommit as autocommit_status"
-            result = self.db.execute_query(autocommit_query)
-            if result:
-                print(f"   Autocommit status: {result[0]['autocommit_status']}")
+            # All session settings in one query, cached for this connection
+            if self._session_vars is None:
+                self._session_vars = self.db.execute_query_one(SESSION_SETTINGS_SQL)
+
+            if self._session_vars:
+                print(
+                    f"   Current isolation level: {self._session_vars['isolation_level']}"
+                )
+                print(
+                    f"   Autocommit status: {self._session_vars['autocommit_status']}"
+                )
+                print(f"   Read only: {self._session_vars['read_only']}")
 
         except Exception as e:
             print(f"   Error: {e}")
 
+    @_buffered_output
     def transaction_best_practices_demo(self):
         """Demonstrate transaction best practices."""
         print("\n=== Transaction Best Practices ===")
@@ -134,65 +308,65 @@ class TransactionExamples:
             product_sku = "ELEC-003"
             order_quantity = 2
 
-            # Step 1: Check product availability
-            product_query = """
-            SELECT product_id, product_name, price, stock_quantity 
-            FROM products WHERE sku = %s
-            """
-            product_result = self.db.execute_query(product_query, (product_sku,))
-
-            if not product_result:
-                print(f"   ✗ Product {product_sku} not found")
-                return
-
-            product = product_result[0]
-            current_stock = int(product["stock_quantity"])
-
-            print(f"   Product: {product['product_name']}")
-            print(f"   Current stock: {current_stock}")
+            print(f"   Product SKU: {product_sku}")
             print(f"   Requested quantity: {order_quantity}")
 
-            # Step 2: Validate stock availability
-            if current_stock < order_quantity:
-                print(
-                    f"   ✗ Insufficient stock (need {order_quantity}, have {current_stock})"
+            try:
+                order = self._with_lock_retry(
+                    lambda: self._attempt_place_order(
+                        customer_id, product_sku, order_quantity
+                    )
                 )
+            except RuntimeError as e:
+                print(f"   ✗ Order rolled back: {e}")
                 return
 
-            # Step 3: Create order (simplified)
-            create_order_query = """
-            INSERT INTO orders (customer_id, order_date, status, total_amount)
-            VALUES (%s, NOW(), 'processing', %s)
-            """
-            total_amount = float(product["price"]) * order_quantity
-            order_rows = self.db.execute_update(
-                create_order_query, (customer_id, total_amount)
-            )
+            new_stock = int(order["stock_quantity"])
+            print(f"   Product: {order['product_name']}")
+            print(f"   Stock before order: {new_stock + order_quantity}")
+            print(f"   ✓ Order #{order['order_id']} created successfully")
+            print(f"   Total amount: ${float(order['total_amount']):.2f}")
+            print(f"   ✓ Stock updated (new quantity: {new_stock})")
 
-            if order_rows > 0:
-                print(f"   ✓ Order created successfully")
-                print(f"   Total amount: ${total_amount:.2f}")
+        except Exception as e:
+            print(f"   ✗ Order processing failed: {e}")
 
-                # Step 4: Update stock
-                update_stock_query = """
-                UPDATE products SET stock_quantity = stock_quantity - %s WHERE sku = %s
-                """
-                stock_rows = self.db.execute_update(
-                    update_stock_query, (order_quantity, product_sku)
+    def _attempt_place_order(
+        self, customer_id: int, product_sku: str, order_quantity: int
+    ) -> Dict[str, Any]:
+        """Take the stock and create the order in one transaction; return a summary."""
+        assert self.db is not None
+        # One READ COMMITTED transaction: only the product row is locked.
+        # The statements are prepared once per connection and reused.
+        with self.db.transaction():
+            # Step 1: Take the stock; no row means missing or too little
+            stock_rows = self.db.execute_update_prepared(
+                TAKE_STOCK_SQL, (order_quantity, product_sku, order_quantity)
+            )
+            if stock_rows == 0:
+                raise RuntimeError(
+                    f"product {product_sku} not found or insufficient stock"
                 )
 
-                if stock_rows > 0:
-                    print(
-                        f"   ✓ Stock updated (new quantity: {current_stock - order_quantity})"
-                    )
-                else:
-                    print("   ✗ Failed to update stock")
-            else:
-                print("   ✗ Failed to create order")
+            # Step 2: Create the order, priced from the locked row
+            # The new order's id comes back with the INSERT itself
+            order_id = self.db.execute_update_with_id(
+                CREATE_ORDER_SQL,
+                (customer_id, order_quantity, product_sku),
+                prepared=True,
+            )
+            if not order_id:
+                raise RuntimeError("failed to create order")
 
-        except Exception as e:
-            print(f"   ✗ Order processing failed: {e}")
+            # Step 3: Read the order and the product's new stock back together
+            order = self.db.execute_query_one(
+                ORDER_SUMMARY_SQL, (product_sku, order_id)
+            )
+            if not order:
+                raise RuntimeError("failed to read the order back")
+        return order
 
+    @_buffered_output
     def locking_demo(self):
         """Demonstrate locking concepts."""
         print("\n=== Locking Demo ===")
@@ -204,21 +378,14 @@ class TransactionExamples:
         print("\n1. Table locking information:")
 
         try:
-            # Show current locks (if any)
-            locks_query = """
-            SELECT 
-                OBJECT_SCHEMA,
-                OBJECT_NAME,
-                LOCK_TYPE,
-                LOCK_MODE,
-                LOCK_STATUS
-            FROM performance_schema.metadata_locks
-            WHERE OBJECT_SCHEMA = DATABASE()
-            LIMIT 5
-            """
-
-            try:
-                locks_result = self.db.execute_query(locks_query)
+            if not self._perf_schema_enabled():
+                print("   Lock information needs performance_schema enabled")
+            else:
+                # Pure read: a read-only transaction needs no transaction id
+                with self.db.transaction(read_only=True):
+                    locks_result = self.db.execute_query(
+                        METADATA_LOCKS_SQL, (DatabaseConfig.DATABASE,)
+                    )
                 if locks_result:
                     print("   Current locks:")
                     for lock in locks_result:
@@ -227,25 +394,15 @@ class TransactionExamples:
                         )
                 else:
                     print("   No active locks found")
-            except Exception as e:
-                print(f"   Could not retrieve lock information: {e}")
 
             # Show deadlock information
             print("\n2. Deadlock prevention tips:")
-            tips = [
-                "- Always acquire locks in the same order",
-                "- Keep transactions short",
-                "- Use appropriate isolation levels",
-                "- Handle deadlock exceptions gracefully",
-                "- Consider using SELECT FOR UPDATE for explicit locking",
-            ]
-
-            for tip in tips:
-                print(f"   {tip}")
+            print("\n".join(f"   {tip}" for tip in DEADLOCK_TIPS))
 
         except Exception as e:
             print(f"   Error: {e}")
 
+    @_buffered_output
     def performance_monitoring_demo(self):
         """Demonstrate transaction performance monitoring."""
         print("\n=== Performance Monitoring Demo ===")
@@ -257,38 +414,20 @@ class TransactionExamples:
         print("\n1. Transaction performance metrics:")
 
         try:
-            # Show transaction-related status variables
-            status_queries = [
-                ("Questions", "SHOW STATUS LIKE 'Questions'"),
-                ("Com_commit", "SHOW STATUS LIKE 'Com_commit'"),
-                ("Com_rollback", "SHOW STATUS LIKE 'Com_rollback'"),
-                ("Innodb_rows_read", "SHOW STATUS LIKE 'Innodb_rows_read'"),
-                ("Innodb_rows_inserted", "SHOW STATUS LIKE 'Innodb_rows_inserted'"),
-                ("Innodb_rows_updated", "SHOW STATUS LIKE 'Innodb_rows_updated'"),
-                ("Innodb_rows_deleted", "SHOW STATUS LIKE 'Innodb_rows_deleted'"),
-            ]
-
-            for name, query in status_queries:
-                try:
-                    result = self.db.execute_query(query)
-                    if result:
-                        value = result[0].get("Value", "N/A")
-                        print(f"   {name}: {value}")
-                except Exception as e:
-                    print(f"   {name}: Error - {e}")
+            # All transaction-related status variables in one result set
+            with self.db.transaction(read_only=True):
+                if self._perf_schema_enabled():
+                    result = self.db.execute_query(GLOBAL_STATUS_SQL, STATUS_VARIABLES)
+                else:
+                    # SHOW STATUS takes the same filter without performance_schema
+                    result = self.db.execute_query(SHOW_STATUS_SQL, STATUS_VARIABLES)
+
+            values = {row["Variable_name"]: row["Value"] for row in result or []}
+            for name in STATUS_VARIABLES:
+                print(f"   {name}: {values.get(name, 'N/A')}")
 
             print("\n2. Performance optimization tips:")
-            optimization_tips = [
-                "- Use indexes on frequently queried columns",
-                "- Avoid long-running transactions",
-                "- Batch multiple operations when possible",
-                "- Monitor slow query log",
-                "- Use EXPLAIN to analyze query performance",
-                "- Consider connection pooling for high-load applications",
-            ]
-
-            for tip in optimization_tips:
-                print(f"   {tip}")
+            print("\n".join(f"   {tip}" for tip in OPTIMIZATION_TIPS))
 
         except Exception as e:
             print(f"   Error: {e}")
@@ -4,25 +4,205 @@ Challenge exercises for advanced MySQL concepts including optimization,
 complex analytics, and database design.
 """
 
+import json
 import os
 import sys
-from typing import Optional
+from itertools import starmap
+from typing import Any, Dict, List, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import MySQLConnection
+from mysql.connector import pooling
+
+from config.database import MySQLConnection, create_connection_pool
+from utils.concurrent_runner import run_concurrently
+
+# Independent exercises; each one runs on its own pooled connection.
+EXERCISE_METHODS = (
+    "exercise_1_query_optimization",
+    "exercise_2_complex_analytics",
+    "exercise_3_data_warehousing",
+    "exercise_4_database_design",
+    "exercise_5_performance_tuning",
+)
+
+# Optional summary tables, installed by schemas/summary_tables.sql: triggers
+# record which keys a change touched, and a refresh recomputes only those keys
+# from the base tables. Without them exercise 2 aggregates the base tables.
+
+# Recompute the logged keys up to a high watermark, then consume their log
+# entries; changes logged meanwhile stay for the next refresh
+CLV_MV_REFRESH = """
+SELECT MAX(log_id) INTO @clv_hw FROM customer_clv_mlog;
+DELETE FROM customer_clv_mv WHERE customer_id IN (
+    SELECT customer_id FROM customer_clv_mlog WHERE log_id <= @clv_hw
+);
+INSERT INTO customer_clv_mv
+    (customer_id, total_orders, total_revenue, first_order, last_order)
+SELECT
+    customer_id,
+    COUNT(*),
+    SUM(total_amount),
+    MIN(order_date),
+    MAX(order_date)
+FROM orders
+WHERE customer_id IN (
+    SELECT customer_id FROM customer_clv_mlog WHERE log_id <= @clv_hw
+)
+GROUP BY customer_id;
+DELETE FROM customer_clv_mlog WHERE log_id <= @clv_hw
+"""
+
+AFFINITY_MV_REFRESH = """
+SELECT MAX(log_id) INTO @affinity_hw FROM product_affinity_mlog;
+DELETE FROM product_orders_mv WHERE product_id IN (
+    SELECT product_id FROM product_affinity_mlog WHERE log_id <= @affinity_hw
+);
+INSERT INTO product_orders_mv (product_id, order_count)
+SELECT product_id, COUNT(DISTINCT order_id)
+FROM order_items
+WHERE product_id IN (
+    SELECT product_id FROM product_affinity_mlog WHERE log_id <= @affinity_hw
+)
+GROUP BY product_id;
+DELETE FROM product_affinity_mv
+WHERE product_a IN (
+    SELECT product_id FROM product_affinity_mlog WHERE log_id <= @affinity_hw
+)
+OR product_b IN (
+    SELECT product_id FROM product_affinity_mlog WHERE log_id <= @affinity_hw
+);
+INSERT INTO product_affinity_mv (product_a, product_b, times_bought_together)
+WITH stale AS (
+    SELECT DISTINCT product_id
+    FROM product_affinity_mlog
+    WHERE log_id <= @affinity_hw
+),
+-- Only orders holding a stale product can contain a stale pair
+stale_orders AS (
+    SELECT DISTINCT oi.order_id
+    FROM order_items oi
+    JOIN stale ON stale.product_id = oi.product_id
+)
+SELECT oi1.product_id, oi2.product_id, COUNT(*)
+FROM stale_orders
+JOIN order_items oi1 ON oi1.order_id = stale_orders.order_id
+JOIN order_items oi2
+    ON oi1.order_id = oi2.order_id AND oi1.product_id < oi2.product_id
+WHERE oi1.product_id IN (SELECT product_id FROM stale)
+OR oi2.product_id IN (SELECT product_id FROM stale)
+GROUP BY oi1.product_id, oi2.product_id;
+DELETE FROM product_affinity_mlog WHERE log_id <= @affinity_hw
+"""
+
+# Base-table equivalents of the summary tables, used when they are not installed
+CLV_FROM_ORDERS = """(
+    SELECT
+        customer_id,
+        COUNT(*) AS total_orders,
+        SUM(total_amount) AS total_revenue,
+        MIN(order_date) AS first_order,
+        MAX(order_date) AS last_order
+    FROM orders
+    GROUP BY customer_id
+)"""
+PRODUCT_ORDERS_FROM_ORDER_ITEMS = """(
+    SELECT product_id, COUNT(DISTINCT order_id) AS order_count
+    FROM order_items
+    GROUP BY product_id
+)"""
+AFFINITY_FROM_ORDER_ITEMS = """(
+    SELECT
+        oi1.product_id AS product_a,
+        oi2.product_id AS product_b,
+        COUNT(*) AS times_bought_together
+    FROM order_items oi1
+    JOIN order_items oi2
+        ON oi1.order_id = oi2.order_id AND oi1.product_id < oi2.product_id
+    GROUP BY oi1.product_id, oi2.product_id
+)"""
+
+# Indexable replacement for the suffix match email LIKE '%@domain'
+EMAIL_DOMAIN_DDL = """
+ALTER TABLE customers
+    ADD COLUMN email_domain VARCHAR(100)
+        GENERATED ALWAYS AS (SUBSTRING_INDEX(email, '@', -1)) STORED,
+    ADD INDEX idx_customer_domain_city (email_domain, city)
+"""
+
+# Function-free, index-ordered grouping key for daily summaries; the index
+# also covers the summary aggregates
+ORDER_DAY_DDL = """
+ALTER TABLE orders
+    ADD COLUMN order_day DATE GENERATED ALWAYS AS (DATE(order_date)) STORED,
+    ADD INDEX idx_order_day (order_day, total_amount, customer_id)
+"""
+
+COLUMN_EXISTS_SQL = """
+SELECT COUNT(*) AS n
+FROM INFORMATION_SCHEMA.COLUMNS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+"""
+
+INDEX_EXISTS_SQL = """
+SELECT COUNT(*) AS n
+FROM INFORMATION_SCHEMA.STATISTICS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+"""
+
+# Lets the affinity self-join find each order's products from the index alone
+ORDER_ITEMS_COVERING_DDL = """
+CREATE INDEX idx_oi_order_product ON order_items (order_id, product_id)
+"""
+
+MV_EXISTS_SQL = """
+SELECT COUNT(*) AS n
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+# Report rows, filled positionally from tuple rows whose columns are
+# selected in exactly this order; money arrives as DOUBLE, since it is
+# only displayed
+CLV_ROW = "   {0:<20.20} | {1:<12.12} | {2:>6} | ${3:>7.2f} | ${4:>9.2f}\n"
+SALES_SUMMARY_ROW = (
+    "   {0!s:<10} | {1:>6} | ${2:>7.2f} | {3:>9} | ${4:>8.2f} | {5:>7.1f}%\n"
+)
+
+
+def explain_tables(node: Any) -> List[Dict[str, Any]]:
+    """Collect the per-table access entries of an EXPLAIN FORMAT=JSON plan."""
+    tables = []
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "table" and isinstance(value, dict):
+                tables.append(
+                    {
+                        "table": value.get("table_name"),
+                        "access_type": value.get("access_type"),
+                        "key": value.get("key"),
+                        "rows_examined_per_scan": value.get("rows_examined_per_scan"),
+                        "cost_info": value.get("cost_info", {}),
+                    }
+                )
+            tables.extend(explain_tables(value))
+    elif isinstance(node, list):
+        for item in node:
+            tables.extend(explain_tables(item))
+    return tables
 
 
 class AdvancedExercises:
     """Advanced level MySQL exercises."""
 
-    def __init__(self):
+    def __init__(self, pool: Optional[pooling.MySQLConnectionPool] = None):
+        self.pool = pool
         self.db: Optional[MySQLConnection] = None
 
     def setup(self) -> bool:
         """Setup database connection."""
         try:
-            self.db = MySQLConnection()
+            self.db = MySQLConnection(self.pool)
             return self.db.connect()
         except Exception as e:
             print(f"Failed to setup database connection: {e}")
@@ -40,6 +220,75 @@ class AdvancedExercises:
             return False
         return True
 
+    def prepare_schema(self):
+        """Add the columns and indexes the exercises rely on.
+
+        Run once before the exercises, so that concurrent exercises never
+        race each other's DDL on the same tables.
+        """
+        if not self._check_connection():
+            return
+
+        print("Preparing schema objects:")
+        self._ensure_generated_column("customers", "email_domain", EMAIL_DOMAIN_DDL)
+        self._ensure_generated_column("orders", "order_day", ORDER_DAY_DDL)
+        self._ensure_index(
+            "order_items", "idx_oi_order_product", ORDER_ITEMS_COVERING_DDL
+        )
+        print()
+
+    def _ensure_schema(
+        self, exists_query: str, table: str, name: str, ddl: str
+    ) -> bool:
+        """Run ddl unless exists_query finds name on table already."""
+        assert self.db is not None
+
+        # The existence probes repeat within a run, so they are prepared once
+        exists = self.db.execute_query_prepared(exists_query, (table, name))
+        if exists is None:
+            return False
+        if exists[0]["n"]:
+            return True
+
+        self.db.last_error = None
+        self.db.execute_update(ddl)
+        if self.db.last_error:
+            return False
+        print(f"   ✓ Added {table}.{name}")
+        return True
+
+    def _ensure_generated_column(self, table: str, column: str, ddl: str) -> bool:
+        """Run ddl to add an indexed generated column if it is missing."""
+        return self._ensure_schema(COLUMN_EXISTS_SQL, table, column, ddl)
+
+    def _ensure_index(self, table: str, index: str, ddl: str) -> bool:
+        """Run ddl to add an index if it is missing."""
+        return self._ensure_schema(INDEX_EXISTS_SQL, table, index, ddl)
+
+    def _refresh_mv(self, name: str, refresh: str) -> bool:
+        """Apply the logged changes to a summary table, if it is installed."""
+        assert self.db is not None
+
+        exists = self.db.execute_query_prepared(MV_EXISTS_SQL, (name,))
+        if not exists or not exists[0]["n"]:
+            return False
+
+        refreshed = self.db.execute_script(refresh)
+        if not refreshed:
+            print(f"   ✗ Could not refresh {name}")
+            return False
+        # The last statement consumes the applied log entries
+        print(f"   ✓ {name} refreshed ({refreshed[-1][1]} logged change(s))")
+        return True
+
+    def _refresh_clv_mv(self) -> bool:
+        """Bring customer_clv_mv up to date with the orders table."""
+        return self._refresh_mv("customer_clv_mv", CLV_MV_REFRESH)
+
+    def _refresh_affinity_mv(self) -> bool:
+        """Bring product_affinity_mv up to date with the order_items table."""
+        return self._refresh_mv("product_affinity_mv", AFFINITY_MV_REFRESH)
+
     def exercise_1_query_optimization(self):
         """
         Exercise 1: Query Optimization Challenge
@@ -75,30 +324,62 @@ class AdvancedExercises:
         ORDER BY total_spent DESC
         """
 
+        # Same result: the domain filter seeks idx_customer_domain_city, and as
+        # HAVING drops customers without orders the join can be inner, with
+        # the filtered customers pinned as the outer table
+        optimized_query = """
+        SELECT 
+            c.first_name,
+            c.last_name,
+            c.email,
+            COUNT(o.order_id) as order_count,
+            SUM(o.total_amount) as total_spent,
+            MAX(o.order_date) as last_order
+        FROM customers c
+        STRAIGHT_JOIN orders o ON c.customer_id = o.customer_id
+        WHERE c.email_domain = 'email.com'
+        AND c.city IN ('New York', 'Los Angeles', 'Chicago')
+        GROUP BY c.customer_id, c.first_name, c.last_name, c.email
+        HAVING total_spent > 100
+        ORDER BY total_spent DESC
+        """
+
         try:
             print("   Original query performance:")
             explain_query = f"EXPLAIN FORMAT=JSON {slow_query}"
             explain_result = self.db.execute_query(explain_query)
 
             if explain_result:
-                # Simplified explain output
-                print("   ✓ Query analyzed (use EXPLAIN for detailed analysis)")
-
-            # Execute the query
-            results = self.db.execute_query(slow_query)
-            if results:
-                print(f"   Query returned {len(results)} rows")
-                for row in results[:3]:  # Show first 3
+                plan = json.loads(explain_result[0]["EXPLAIN"])
+                cost = plan["query_block"].get("cost_info", {}).get("query_cost")
+                print(f"   ✓ Query analyzed (estimated cost {cost})")
+                for entry in explain_tables(plan):
                     print(
-                        f"   - {row['first_name']} {row['last_name']}: ${row['total_spent']:.2f}"
+                        f"     └─ {entry['table']}: {entry['access_type']}"
+                        f" via {entry['key'] or 'no index'},"
+                        f" ~{entry['rows_examined_per_scan']} rows per scan"
                     )
 
+            # Only the rewritten query is executed, unless the column is missing
+            if self._ensure_generated_column(
+                "customers", "email_domain", EMAIL_DOMAIN_DDL
+            ):
+                print("   Rewritten query (email_domain index, STRAIGHT_JOIN):")
+                query = optimized_query
+            else:
+                query = slow_query
+            # Only the top 3 are shown, so only they are sent
+            print("   Top customers:")
+            for row in self.db.execute_query_stream(query, limit=3):
+                first_name, last_name, total_spent = row[0], row[1], row[4]
+                print(f"   - {first_name} {last_name}: ${total_spent:.2f}")
+
         except Exception as e:
             print(f"   Error analyzing query: {e}")
 
         print("\n2. Optimization suggestions:")
         optimizations = [
-            "CREATE INDEX idx_customers_email_city ON customers(email, city)",
+            "Replace suffix LIKE filters with an indexed generated column",
             "CREATE INDEX idx_orders_customer_amount ON orders(customer_id, total_amount)",
             "Consider partitioning orders table by date",
             "Use covering indexes for frequently accessed columns",
@@ -124,36 +405,34 @@ class AdvancedExercises:
 
         print("\n1. Customer Lifetime Value (CLV) Analysis:")
 
-        clv_query = """
+        # Per-customer totals come pre-aggregated from customer_clv_mv when it
+        # is installed; the printed table shows the top 100, with columns in
+        # CLV_ROW order
+        clv_source = "customer_clv_mv" if self._refresh_clv_mv() else CLV_FROM_ORDERS
+        clv_query = f"""
         SELECT 
-            c.customer_id,
             CONCAT(c.first_name, ' ', c.last_name) as customer_name,
-            c.email,
-            COUNT(DISTINCT o.order_id) as total_orders,
-            DATEDIFF(MAX(o.order_date), MIN(o.order_date)) + 1 as customer_lifespan_days,
-            SUM(o.total_amount) as total_revenue,
-            AVG(o.total_amount) as avg_order_value,
-            SUM(o.total_amount) / NULLIF(COUNT(DISTINCT o.order_id), 0) as revenue_per_order,
-            CASE 
-                WHEN DATEDIFF(MAX(o.order_date), MIN(o.order_date)) = 0 THEN SUM(o.total_amount)
-                ELSE SUM(o.total_amount) / (DATEDIFF(MAX(o.order_date), MIN(o.order_date)) + 1) * 365
-            END as estimated_annual_value,
             CASE
-                WHEN SUM(o.total_amount) >= 1000 THEN 'High Value'
-                WHEN SUM(o.total_amount) >= 500 THEN 'Medium Value'  
-                WHEN SUM(o.total_amount) >= 100 THEN 'Low Value'
+                WHEN mv.total_revenue >= 1000 THEN 'High Value'
+                WHEN mv.total_revenue >= 500 THEN 'Medium Value'  
+                WHEN mv.total_revenue >= 100 THEN 'Low Value'
                 ELSE 'New Customer'
-            END as customer_segment
-        FROM customers c
-        LEFT JOIN orders o ON c.customer_id = o.customer_id
-        WHERE o.order_id IS NOT NULL
-        GROUP BY c.customer_id, c.first_name, c.last_name, c.email
-        ORDER BY total_revenue DESC
+            END as customer_segment,
+            mv.total_orders,
+            CAST(mv.total_revenue AS DOUBLE) as total_revenue,
+            CAST(CASE 
+                WHEN DATEDIFF(mv.last_order, mv.first_order) = 0 THEN mv.total_revenue
+                ELSE mv.total_revenue / (DATEDIFF(mv.last_order, mv.first_order) + 1) * 365
+            END AS DOUBLE) as estimated_annual_value
+        FROM {clv_source} mv
+        JOIN customers c ON c.customer_id = mv.customer_id
+        ORDER BY mv.total_revenue DESC
+        LIMIT 100
         """
 
         try:
-            results = self.db.execute_query(clv_query)
-            if results:
+            result = self.db.execute_query_tuple(clv_query)
+            if result and result[1]:
                 print("   Customer Lifetime Value Analysis:")
                 print(
                     "   Name                 | Segment      | Orders | Revenue  | Est. Annual"
@@ -162,36 +441,34 @@ class AdvancedExercises:
                     "   ---------------------|--------------|--------|----------|------------"
                 )
 
-                for row in results:
-                    name = row["customer_name"][:20].ljust(20)
-                    segment = row["customer_segment"][:12].ljust(12)
-                    orders = str(row["total_orders"]).rjust(6)
-                    revenue = f"${row['total_revenue']:.2f}".rjust(8)
-                    annual = f"${row['estimated_annual_value']:.2f}".rjust(10)
-
-                    print(f"   {name} | {segment} | {orders} | {revenue} | {annual}")
+                sys.stdout.writelines(starmap(CLV_ROW.format, result[1]))
         except Exception as e:
             print(f"   Error: {e}")
 
         print("\n2. Product Affinity Analysis:")
 
-        affinity_query = """
+        # Pair counts and per-product order counts come from the summary tables
+        # when they are installed
+        if self._refresh_affinity_mv():
+            pairs, product_orders = "product_affinity_mv", "product_orders_mv"
+        else:
+            pairs, product_orders = (
+                AFFINITY_FROM_ORDER_ITEMS,
+                PRODUCT_ORDERS_FROM_ORDER_ITEMS,
+            )
+        affinity_query = f"""
         SELECT 
             p1.product_name as product_a,
             p2.product_name as product_b,
-            COUNT(*) as times_bought_together,
-            ROUND(COUNT(*) * 100.0 / (
-                SELECT COUNT(DISTINCT oi1.order_id) 
-                FROM order_items oi1 
-                WHERE oi1.product_id = p1.product_id
-            ), 2) as affinity_percentage
-        FROM order_items oi1
-        JOIN order_items oi2 ON oi1.order_id = oi2.order_id AND oi1.product_id < oi2.product_id
-        JOIN products p1 ON oi1.product_id = p1.product_id
-        JOIN products p2 ON oi2.product_id = p2.product_id
-        GROUP BY p1.product_id, p2.product_id, p1.product_name, p2.product_name
-        HAVING times_bought_together >= 1
-        ORDER BY times_bought_together DESC, affinity_percentage DESC
+            mv.times_bought_together,
+            CAST(
+                ROUND(mv.times_bought_together * 100.0 / po.order_count, 2) AS DOUBLE
+            ) as affinity_percentage
+        FROM {pairs} mv
+        JOIN {product_orders} po ON mv.product_a = po.product_id
+        JOIN products p1 ON mv.product_a = p1.product_id
+        JOIN products p2 ON mv.product_b = p2.product_id
+        ORDER BY mv.times_bought_together DESC, affinity_percentage DESC
         LIMIT 10
         """
 
@@ -225,16 +502,13 @@ class AdvancedExercises:
             return
         assert self.db is not None
 
-        print("\n1. Creating sales summary table:")
+        print("\n1. Refreshing sales summary table:")
 
         # Create summary table
         try:
-            # Drop if exists
-            self.db.execute_update("DROP TABLE IF EXISTS sales_summary")
-
-            # Create summary table
+            # Kept between runs; only days from the watermark on are recomputed
             create_summary = """
-            CREATE TABLE sales_summary (
+            CREATE TABLE IF NOT EXISTS sales_summary (
                 summary_date DATE PRIMARY KEY,
                 total_orders INT DEFAULT 0,
                 total_revenue DECIMAL(12,2) DEFAULT 0.00,
@@ -246,23 +520,45 @@ class AdvancedExercises:
             """
 
             self.db.execute_update(create_summary)
-            print("   ✓ Sales summary table created")
+            print("   ✓ Sales summary table ready")
+
+            # Group on the indexed order_day column when it can be added
+            day = "DATE(order_date)"
+            if self._ensure_generated_column("orders", "order_day", ORDER_DAY_DDL):
+                day = "order_day"
+
+            # The last summarised day may have been partial, so it is redone.
+            # Orders back-dated before it or edited later are not picked up;
+            # drop sales_summary to rebuild it from scratch.
+            watermark = self.db.execute_query_one(
+                "SELECT COALESCE(MAX(summary_date), '1000-01-01') AS hw "
+                "FROM sales_summary"
+            )
+            if watermark is None:
+                return
+            hw = watermark["hw"]
 
             # Populate with data
-            populate_summary = """
+            populate_summary = f"""
             INSERT INTO sales_summary (summary_date, total_orders, total_revenue, total_customers, avg_order_value)
             SELECT 
-                DATE(order_date) as summary_date,
+                {day} as summary_date,
                 COUNT(*) as total_orders,
                 SUM(total_amount) as total_revenue,
                 COUNT(DISTINCT customer_id) as total_customers,
                 AVG(total_amount) as avg_order_value
             FROM orders
-            GROUP BY DATE(order_date)
+            WHERE {day} >= %s
+            GROUP BY {day}
+            ON DUPLICATE KEY UPDATE
+                total_orders = VALUES(total_orders),
+                total_revenue = VALUES(total_revenue),
+                total_customers = VALUES(total_customers),
+                avg_order_value = VALUES(avg_order_value)
             """
 
-            rows = self.db.execute_update(populate_summary)
-            print(f"   ✓ Populated with {rows} daily summaries")
+            self.db.execute_update(populate_summary, (hw,))
+            print(f"   ✓ Refreshed daily summaries from {hw} onward")
 
         except Exception as e:
             print(f"   Error creating summary table: {e}")
@@ -270,24 +566,34 @@ class AdvancedExercises:
         print("\n2. Sales summary report:")
 
         try:
+            # The previous day's revenue is computed once and reused
             summary_query = """
+            WITH s AS (
+                SELECT 
+                    summary_date,
+                    total_orders,
+                    total_revenue,
+                    total_customers,
+                    avg_order_value,
+                    LAG(total_revenue) OVER (ORDER BY summary_date) as prev_day_revenue
+                FROM sales_summary
+            )
             SELECT 
                 summary_date,
                 total_orders,
-                total_revenue,
+                CAST(total_revenue AS DOUBLE) as total_revenue,
                 total_customers,
-                avg_order_value,
-                LAG(total_revenue) OVER (ORDER BY summary_date) as prev_day_revenue,
-                ROUND(
-                    (total_revenue - LAG(total_revenue) OVER (ORDER BY summary_date)) 
-                    / NULLIF(LAG(total_revenue) OVER (ORDER BY summary_date), 0) * 100, 2
-                ) as revenue_growth_pct
-            FROM sales_summary
+                CAST(avg_order_value AS DOUBLE) as avg_order_value,
+                CAST(COALESCE(ROUND(
+                    (total_revenue - prev_day_revenue)
+                    / NULLIF(prev_day_revenue, 0) * 100, 2
+                ), 0) AS DOUBLE) as revenue_growth_pct
+            FROM s
             ORDER BY summary_date
             """
 
-            results = self.db.execute_query(summary_query)
-            if results:
+            result = self.db.execute_query_tuple(summary_query)
+            if result and result[1]:
                 print("   Daily Sales Summary:")
                 print(
                     "   Date       | Orders | Revenue  | Customers | Avg Order | Growth %"
@@ -296,17 +602,7 @@ class AdvancedExercises:
                     "   -----------|--------|----------|-----------|-----------|----------"
                 )
 
-                for row in results:
-                    date = str(row["summary_date"])
-                    orders = str(row["total_orders"]).rjust(6)
-                    revenue = f"${row['total_revenue']:.2f}".rjust(8)
-                    customers = str(row["total_customers"]).rjust(9)
-                    avg_order = f"${row['avg_order_value']:.2f}".rjust(9)
-                    growth = f"{row['revenue_growth_pct'] or 0:.1f}%".rjust(8)
-
-                    print(
-                        f"   {date} | {orders} | {revenue} | {customers} | {avg_order} | {growth}"
-                    )
+                sys.stdout.writelines(starmap(SALES_SUMMARY_ROW.format, result[1]))
 
         except Exception as e:
             print(f"   Error: {e}")
@@ -326,37 +622,50 @@ class AdvancedExercises:
             return
         assert self.db is not None
 
+        # Analyze table sizes
+        table_analysis = """
+        SELECT 
+            TABLE_NAME,
+            TABLE_ROWS,
+            ROUND(DATA_LENGTH / 1024 / 1024, 2) as data_size_mb,
+            ROUND(INDEX_LENGTH / 1024 / 1024, 2) as index_size_mb,
+            ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024 / 1024, 2) as total_size_mb
+        FROM INFORMATION_SCHEMA.TABLES
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY (DATA_LENGTH + INDEX_LENGTH) DESC
+        """
+
+        fk_analysis = """
+        SELECT 
+            TABLE_NAME,
+            COLUMN_NAME,
+            REFERENCED_TABLE_NAME,
+            REFERENCED_COLUMN_NAME,
+            CONSTRAINT_NAME
+        FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE()
+        AND REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY TABLE_NAME, COLUMN_NAME
+        """
+
+        # Both result sets come back in one round trip
+        results = self.db.execute_multi([table_analysis, fk_analysis])
+        (_, table_rows), (_, fk_rows) = results or [(None, []), (None, [])]
+
         print("\n1. Schema analysis:")
 
         try:
-            # Analyze table sizes
-            table_analysis = """
-            SELECT 
-                TABLE_NAME,
-                TABLE_ROWS,
-                ROUND(DATA_LENGTH / 1024 / 1024, 2) as data_size_mb,
-                ROUND(INDEX_LENGTH / 1024 / 1024, 2) as index_size_mb,
-                ROUND((DATA_LENGTH + INDEX_LENGTH) / 1024 / 1024, 2) as total_size_mb
-            FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND TABLE_TYPE = 'BASE TABLE'
-            ORDER BY (DATA_LENGTH + INDEX_LENGTH) DESC
-            """
-
-            results = self.db.execute_query(table_analysis)
-            if results:
+            if table_rows:
                 print("   Table Size Analysis:")
                 print("   Table Name       | Rows | Data MB | Index MB | Total MB")
                 print("   -----------------|------|---------|----------|----------")
 
-                for row in results:
-                    table = row["TABLE_NAME"][:16].ljust(16)
-                    rows = str(row["TABLE_ROWS"] or 0).rjust(4)
-                    data_mb = f"{row['data_size_mb'] or 0:.2f}".rjust(7)
-                    index_mb = f"{row['index_size_mb'] or 0:.2f}".rjust(8)
-                    total_mb = f"{row['total_size_mb'] or 0:.2f}".rjust(8)
-
-                    print(f"   {table} | {rows} | {data_mb} | {index_mb} | {total_mb}")
+                for table, rows, data_mb, index_mb, total_mb in table_rows:
+                    print(
+                        f"   {table:<16.16} | {rows or 0:>4} | {data_mb or 0:>7.2f}"
+                        f" | {index_mb or 0:>8.2f} | {total_mb or 0:>8.2f}"
+                    )
 
         except Exception as e:
             print(f"   Error: {e}")
@@ -364,31 +673,15 @@ class AdvancedExercises:
         print("\n2. Foreign key relationships:")
 
         try:
-            fk_analysis = """
-            SELECT 
-                TABLE_NAME,
-                COLUMN_NAME,
-                REFERENCED_TABLE_NAME,
-                REFERENCED_COLUMN_NAME,
-                CONSTRAINT_NAME
-            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-            WHERE TABLE_SCHEMA = DATABASE()
-            AND REFERENCED_TABLE_NAME IS NOT NULL
-            ORDER BY TABLE_NAME, COLUMN_NAME
-            """
-
-            results = self.db.execute_query(fk_analysis)
-            if results:
+            if fk_rows:
                 print("   Foreign Key Relationships:")
                 current_table = ""
-                for row in results:
-                    if row["TABLE_NAME"] != current_table:
-                        current_table = row["TABLE_NAME"]
+                for table, column, ref_table, ref_column, _ in fk_rows:
+                    if table != current_table:
+                        current_table = table
                         print(f"\n   {current_table}:")
 
-                    print(
-                        f"     {row['COLUMN_NAME']} -> {row['REFERENCED_TABLE_NAME']}.{row['REFERENCED_COLUMN_NAME']}"
-                    )
+                    print(f"     {column} -> {ref_table}.{ref_column}")
 
         except Exception as e:
             print(f"   Error: {e}")
@@ -401,7 +694,7 @@ class AdvancedExercises:
             "✓ Good: Appropriate indexes for common queries",
             "→ Consider: Adding created_at/updated_at to all tables",
             "→ Consider: Soft deletes instead of hard deletes",
-            "→ Consider: Partitioning large tables by date",
+            "→ Consider: Partitioning large tables by date (needs the FKs dropped)",
             "→ Consider: Archive strategy for old data",
             "→ Consider: Adding audit trail tables",
         ]
@@ -436,15 +729,21 @@ class AdvancedExercises:
                 "max_heap_table_size",
             ]
 
+            # One round trip for all of them, printed in the order above
+            placeholders = ", ".join(["%s"] * len(important_vars))
+            result = self.db.execute_query(
+                f"SHOW VARIABLES WHERE Variable_name IN ({placeholders})",
+                tuple(important_vars),
+            )
+            values = {row["Variable_name"]: row["Value"] for row in result or []}
+
             print("   Key MySQL Configuration Variables:")
             for var in important_vars:
-                try:
-                    result = self.db.execute_query(f"SHOW VARIABLES LIKE '{var}'")
-                    if result:
-                        value = result[0].get("Value", "N/A")
-                        print(f"   - {var}: {value}")
-                except Exception:
+                if result is None:
                     print(f"   - {var}: Unable to retrieve")
+                else:
+                    # query_cache_size no longer exists in MySQL 8.0
+                    print(f"   - {var}: {values.get(var, 'N/A')}")
 
         except Exception as e:
             print(f"   Error: {e}")
@@ -508,11 +807,16 @@ def main():
             print("Failed to connect to database. Please check your configuration.")
             return
 
-        exercises.exercise_1_query_optimization()
-        exercises.exercise_2_complex_analytics()
-        exercises.exercise_3_data_warehousing()
-        exercises.exercise_4_database_design()
-        exercises.exercise_5_performance_tuning()
+        exercises.prepare_schema()
+
+        pool = create_connection_pool("advanced_exercises", len(EXERCISE_METHODS))
+        if pool:
+            # Overlap the exercises' database waits; each one's output is
+            # printed in the original order
+            run_concurrently(pool, AdvancedExercises, EXERCISE_METHODS)
+        else:
+            for method_name in EXERCISE_METHODS:
+                getattr(exercises, method_name)()
 
         print("\n" + "=" * 30)
         print("🎉 Congratulations! You've completed the advanced exercises!")
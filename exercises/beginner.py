@@ -124,51 +124,49 @@ class BeginnerExercises:
 
         Tasks:
         1. Insert a new category
-        2. Insert a new product in that category
+        2. Insert new products in that category
         3. Update the product price
         """
         print("\n=== Exercise 2: INSERT and UPDATE ===")
 
-        # TODO: Insert a new category
-        print("\n1. Inserting new category 'Toys':")
-        insert_category_query = """
-        INSERT INTO categories (category_name, description)
-        VALUES (%s, %s)
-        """
-
-        try:
-            if not self._check_connection():
-                return
-            assert self.db is not None
-            rows_affected = self.db.execute_update(
-                insert_category_query, ("Toys", "Toys and games for all ages")
-            )
-            print(f"   Inserted {rows_affected} category")
-        except Exception as e:
-            print(f"   Error: {e}")
-
-        # TODO: Insert a new product
-        print("\n2. Inserting new product:")
-        # First get the category_id for 'Toys'
         if not self._check_connection():
             return
         assert self.db is not None
-        get_category_query = (
-            "SELECT category_id FROM categories WHERE category_name = 'Toys'"
-        )
-        category_result = self.db.execute_query(get_category_query)
 
-        if category_result:
-            category_id = category_result[0]["category_id"]
-
-            insert_product_query = """
-            INSERT INTO products (product_name, description, category_id, price, stock_quantity, sku)
-            VALUES (%s, %s, %s, %s, %s, %s)
+        # All three steps commit together at the end of the block
+        with self.db.transaction():
+            # TODO: Insert a new category
+            print("\n1. Inserting new category 'Toys':")
+            # On a re-run the existing row's id is reported instead, so the
+            # category_id comes back without a separate SELECT
+            insert_category_query = """
+            INSERT INTO categories (category_name, description)
+            VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE category_id = LAST_INSERT_ID(category_id)
             """
 
-            try:
-                rows_affected = self.db.execute_update(
-                    insert_product_query,
+            category_id = self.db.execute_update_with_id(
+                insert_category_query, ("Toys", "Toys and games for all ages")
+            )
+            if category_id:
+                print(f"   Category 'Toys' has category_id {category_id}")
+
+            # TODO: Insert new products
+            print("\n2. Inserting new products:")
+            if category_id:
+                # sku is unique, so a re-run resets the existing rows instead
+                # of failing (and rolling back the whole block)
+                insert_product_query = """
+                INSERT INTO products (product_name, description, category_id, price, stock_quantity, sku)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    product_name = VALUES(product_name),
+                    description = VALUES(description),
+                    category_id = VALUES(category_id),
+                    price = VALUES(price),
+                    stock_quantity = VALUES(stock_quantity)
+                """
+                products = [
                     (
                         "LEGO Building Set",
                         "Creative building blocks set",
@@ -177,29 +175,44 @@ class BeginnerExercises:
                         25,
                         "TOY-001",
                     ),
-                )
-                print(f"   Inserted {rows_affected} product")
-            except Exception as e:
-                print(f"   Error: {e}")
-
-        # TODO: Update product price
-        print("\n3. Updating product price:")
-        if not self._check_connection():
-            return
-        assert self.db is not None
-        update_price_query = """
-        UPDATE products 
-        SET price = %s 
-        WHERE sku = %s
-        """
+                    (
+                        "LEGO Space Set",
+                        "Space station building set",
+                        category_id,
+                        89.99,
+                        15,
+                        "TOY-002",
+                    ),
+                    (
+                        "Jigsaw Puzzle",
+                        "1000 piece landscape puzzle",
+                        category_id,
+                        19.99,
+                        40,
+                        "TOY-003",
+                    ),
+                ]
+
+                # executemany sends the rows as one multi-row INSERT
+                error_before = self.db.last_error
+                rows_affected = self.db.execute_many(insert_product_query, products)
+                if self.db.last_error is error_before:
+                    # MySQL counts 1 per inserted row and 2 per updated one
+                    print(f"   Inserted or reset {len(products)} products")
+                    print(f"   Rows affected: {rows_affected}")
+
+            # TODO: Update product price
+            print("\n3. Updating product price:")
+            update_price_query = """
+            UPDATE products 
+            SET price = %s 
+            WHERE sku = %s
+            """
 
-        try:
             rows_affected = self.db.execute_update(
                 update_price_query, (44.99, "TOY-001")
             )
             print(f"   Updated {rows_affected} product price")
-        except Exception as e:
-            print(f"   Error: {e}")
 
     def exercise_3_joins(self):
         """
@@ -274,26 +287,41 @@ class BeginnerExercises:
 
         # TODO: Average order value by month
         print("\n1. Average order value by month:")
-        monthly_avg_query = """
-        SELECT 
-            YEAR(order_date) as year,
-            MONTH(order_date) as month,
-            COUNT(*) as order_count,
-            AVG(total_amount) as avg_order_value
-        FROM orders
-        GROUP BY YEAR(order_date), MONTH(order_date)
-        ORDER BY year, month
+        # ym is an indexed generated column (see schemas/create_tables.sql), so
+        # grouping on it reads pre-sorted groups from idx_ym_total; databases
+        # created before it was added compute the month per row instead
+        ym_column_query = """
+        SELECT COUNT(*) AS n
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'orders' AND COLUMN_NAME = 'ym'
         """
 
         try:
             if not self._check_connection():
                 return
             assert self.db is not None
+            ym_column = self.db.execute_query_one(ym_column_query)
+            ym = (
+                "ym"
+                if ym_column and ym_column["n"]
+                else "DATE_FORMAT(order_date, '%Y-%m')"
+            )
+
+            monthly_avg_query = f"""
+            SELECT 
+                {ym} as ym,
+                COUNT(*) as order_count,
+                AVG(total_amount) as avg_order_value
+            FROM orders
+            GROUP BY {ym}
+            ORDER BY ym
+            """
+
             results = self.db.execute_query(monthly_avg_query)
             if results:
                 for row in results:
                     print(
-                        f"   {row['year']}-{row['month']:02d}: {row['order_count']} orders, avg ${row['avg_order_value']:.2f}"
+                        f"   {row['ym']}: {row['order_count']} orders, avg ${row['avg_order_value']:.2f}"
                     )
         except Exception as e:
             print(f"   Error: {e}")
@@ -5,23 +5,85 @@ Practice intermediate level MySQL operations including complex JOINs, subqueries
 
 import os
 import sys
+from itertools import accumulate, groupby, tee
+from operator import itemgetter
 from typing import Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import MySQLConnection
+from mysql.connector import pooling
+
+from config.database import MySQLConnection, create_connection_pool
+from utils.concurrent_runner import run_concurrently
+
+# Read-only exercises; each one runs on its own pooled connection.
+EXERCISE_METHODS = (
+    "exercise_1_complex_joins",
+    "exercise_2_subqueries_cte",
+    "exercise_3_data_analysis",
+    "exercise_4_indexes_performance",
+)
+
+# Row templates filled from the streamed dict rows; each report is written
+# to stdout in a single call
+NO_ORDERS_ROW = "   {customer_name} ({email}) - {city}, {state}\n"
+UNSOLD_PRODUCT_ROW = "     {product_name}: ${price:.2f} (Stock: {stock_quantity})\n"
+SALES_REPORT_ROW = (
+    "   {customer_name} bought {quantity}x {product_name}\n"
+    "     Category: {category_name}, Total: ${total_price:.2f}\n"
+    "     Date: {order_date}, Status: {status}\n\n"
+)
+HIGH_SPENDER_ROW = (
+    "   {customer_name} ({email})\n"
+    "     Total Spent: ${total_spent:.2f}\n"
+    "     Orders: {order_count}, Avg: ${avg_order_value:.2f}\n\n"
+)
+ABOVE_AVG_ROW = (
+    "   {product_name} ({category_name})\n"
+    "     Price: ${product_price:.2f} vs Avg: ${category_avg:.2f}\n"
+    "     Difference: +${price_difference:.2f}\n\n"
+)
+RUNNING_TOTAL_ROW = (
+    "   {sale_date}: ${daily_total:.2f}\n"
+    "     Running Total: ${running_total:.2f} ({percent_of_total:.1f}%)\n"
+)
+FALLBACK_RUNNING_TOTAL_ROW = (
+    "   {sale_date}: ${daily_total:.2f}\n     Running Total: ${running_total:.2f}\n"
+)
+SEGMENT_HEADER = (
+    "   Segment      | Count | Avg Spent | Min Spent | Max Spent\n"
+    "   -------------|-------|-----------|-----------|----------\n"
+)
+SEGMENT_ROW = (
+    "   {customer_segment:12} | {customer_count:5d} | ${avg_spent:8.2f}"
+    " | ${min_spent:8.2f} | ${max_spent:8.2f}\n"
+)
+CATEGORY_PERFORMANCE_ROW = (
+    "   {category_name}:\n"
+    "     Products: {total_products} total, {products_sold} sold"
+    " ({sell_through_rate:.1f}%)\n"
+    "     Units Sold: {total_units_sold}, Revenue: ${total_revenue:.2f}\n"
+    "     Avg Selling Price: ${avg_selling_price:.2f}"
+    " vs List: ${avg_list_price:.2f}\n\n"
+)
+ORDER_PATTERN_ROW = (
+    "   {day_of_week} {hour_of_day:02d}:00 - {order_count} orders\n"
+    "     Avg: ${avg_order_value:.2f}, Total: ${total_revenue:.2f}\n\n"
+)
+EXPLAIN_ROW = "   Table: {table}, Type: {type}, Rows: {rows}\n"
 
 
 class IntermediateExercises:
     """Intermediate level MySQL exercises."""
 
-    def __init__(self):
+    def __init__(self, pool: Optional[pooling.MySQLConnectionPool] = None):
+        self.pool = pool
         self.db: Optional[MySQLConnection] = None
 
     def setup(self) -> bool:
         """Setup database connection."""
         try:
-            self.db = MySQLConnection()
+            self.db = MySQLConnection(self.pool)
             return self.db.connect()
         except Exception as e:
             print(f"Failed to setup database connection: {e}")
@@ -70,14 +132,16 @@ class IntermediateExercises:
         """
 
         try:
-            results = self.db.execute_query(no_orders_query)
-            if results:
-                for row in results:
-                    print(
-                        f"   {row['customer_name']} ({row['email']}) - {row['city']}, {row['state']}"
-                    )
-            else:
-                print("   All customers have placed orders!")
+            # The stream prints and records its own errors instead of raising
+            error_before = self.db.last_error
+            output = "".join(
+                map(
+                    NO_ORDERS_ROW.format_map,
+                    self.db.execute_query_stream(no_orders_query, dictionary=True),
+                )
+            )
+            if self.db.last_error is error_before:
+                sys.stdout.write(output or "   All customers have placed orders!\n")
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -98,24 +162,35 @@ class IntermediateExercises:
         """
 
         try:
-            results = self.db.execute_query(no_sales_query)
-            if results:
-                current_category = ""
-                for row in results:
-                    if row["category_name"] != current_category:
-                        current_category = row["category_name"]
-                        print(f"\n   {current_category}:")
-                    print(
-                        f"     {row['product_name']}: ${row['price']:.2f} (Stock: {row['stock_quantity']})"
-                    )
-            else:
-                print("   All products have been ordered!")
+            error_before = self.db.last_error
+            lines = []
+            current_category = None
+            for row in self.db.execute_query_stream(no_sales_query, dictionary=True):
+                if row["category_name"] != current_category:
+                    current_category = row["category_name"]
+                    lines.append(f"\n   {current_category}:\n")
+                lines.append(UNSOLD_PRODUCT_ROW.format_map(row))
+            if self.db.last_error is error_before:
+                sys.stdout.write(
+                    "".join(lines) or "   All products have been ordered!\n"
+                )
         except Exception as e:
             print(f"   Error: {e}")
 
         # Task 3: Comprehensive sales report
         print("\n3. Comprehensive sales report:")
+        # The ten newest line items all come from the ten newest orders that
+        # have items, so pick those via idx_order_date before joining
         sales_report_query = """
+        WITH recent_orders AS (
+            SELECT o.order_id, o.customer_id, o.order_date, o.status
+            FROM orders o
+            WHERE EXISTS (
+                SELECT 1 FROM order_items oi WHERE oi.order_id = o.order_id
+            )
+            ORDER BY o.order_date DESC
+            LIMIT 10
+        )
         SELECT 
             CONCAT(c.first_name, ' ', c.last_name) as customer_name,
             cat.category_name,
@@ -125,27 +200,21 @@ class IntermediateExercises:
             oi.total_price,
             o.order_date,
             o.status
-        FROM customers c
-        JOIN orders o ON c.customer_id = o.customer_id
+        FROM recent_orders o
         JOIN order_items oi ON o.order_id = oi.order_id
         JOIN products p ON oi.product_id = p.product_id
         JOIN categories cat ON p.category_id = cat.category_id
+        JOIN customers c ON o.customer_id = c.customer_id
         ORDER BY o.order_date DESC, oi.total_price DESC
         LIMIT 10
         """
 
         try:
-            results = self.db.execute_query(sales_report_query)
-            if results:
-                for row in results:
-                    print(
-                        f"   {row['customer_name']} bought {row['quantity']}x {row['product_name']}"
-                    )
-                    print(
-                        f"     Category: {row['category_name']}, Total: ${row['total_price']:.2f}"
-                    )
-                    print(f"     Date: {row['order_date']}, Status: {row['status']}")
-                    print()
+            lines = map(
+                SALES_REPORT_ROW.format_map,
+                self.db.execute_query_stream(sales_report_query, dictionary=True),
+            )
+            sys.stdout.write("".join(lines))
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -167,36 +236,36 @@ class IntermediateExercises:
         # Task 1: High-spending customers
         print("\n1. Customers who spent more than average:")
         high_spenders_query = """
+        WITH customer_totals AS (
+            SELECT 
+                customer_id,
+                SUM(total_amount) as total_spent,
+                COUNT(*) as order_count
+            FROM orders
+            GROUP BY customer_id
+        ),
+        average_total AS (
+            SELECT AVG(total_spent) as avg_spent FROM customer_totals
+        )
         SELECT 
             CONCAT(c.first_name, ' ', c.last_name) as customer_name,
             c.email,
-            SUM(o.total_amount) as total_spent,
-            COUNT(o.order_id) as order_count,
-            ROUND(SUM(o.total_amount) / COUNT(o.order_id), 2) as avg_order_value
-        FROM customers c
-        JOIN orders o ON c.customer_id = o.customer_id
-        GROUP BY c.customer_id, c.first_name, c.last_name, c.email
-        HAVING SUM(o.total_amount) > (
-            SELECT AVG(customer_total)
-            FROM (
-                SELECT SUM(o2.total_amount) as customer_total
-                FROM orders o2
-                GROUP BY o2.customer_id
-            ) as customer_totals
-        )
-        ORDER BY total_spent DESC
+            ct.total_spent,
+            ct.order_count,
+            ROUND(ct.total_spent / ct.order_count, 2) as avg_order_value
+        FROM customer_totals ct
+        JOIN customers c ON ct.customer_id = c.customer_id
+        CROSS JOIN average_total a
+        WHERE ct.total_spent > a.avg_spent
+        ORDER BY ct.total_spent DESC
         """
 
         try:
-            results = self.db.execute_query(high_spenders_query)
-            if results:
-                for row in results:
-                    print(f"   {row['customer_name']} ({row['email']})")
-                    print(f"     Total Spent: ${row['total_spent']:.2f}")
-                    print(
-                        f"     Orders: {row['order_count']}, Avg: ${row['avg_order_value']:.2f}"
-                    )
-                    print()
+            lines = map(
+                HIGH_SPENDER_ROW.format_map,
+                self.db.execute_query_stream(high_spenders_query, dictionary=True),
+            )
+            sys.stdout.write("".join(lines))
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -204,39 +273,30 @@ class IntermediateExercises:
         print("\n2. Products priced above their category average:")
         above_avg_query = """
         SELECT 
-            p.product_name,
-            c.category_name,
-            p.price as product_price,
-            ROUND((
-                SELECT AVG(p2.price)
-                FROM products p2
-                WHERE p2.category_id = p.category_id
-            ), 2) as category_avg,
-            ROUND(p.price - (
-                SELECT AVG(p2.price)
-                FROM products p2
-                WHERE p2.category_id = p.category_id
-            ), 2) as price_difference
-        FROM products p
-        JOIN categories c ON p.category_id = c.category_id
-        WHERE p.price > (
-            SELECT AVG(p2.price)
-            FROM products p2
-            WHERE p2.category_id = p.category_id
-        )
+            product_name,
+            category_name,
+            price as product_price,
+            ROUND(category_avg, 2) as category_avg,
+            ROUND(price - category_avg, 2) as price_difference
+        FROM (
+            SELECT 
+                p.product_name,
+                c.category_name,
+                p.price,
+                AVG(p.price) OVER (PARTITION BY p.category_id) as category_avg
+            FROM products p
+            JOIN categories c ON p.category_id = c.category_id
+        ) as priced_products
+        WHERE price > category_avg
         ORDER BY price_difference DESC
         """
 
         try:
-            results = self.db.execute_query(above_avg_query)
-            if results:
-                for row in results:
-                    print(f"   {row['product_name']} ({row['category_name']})")
-                    print(
-                        f"     Price: ${row['product_price']:.2f} vs Avg: ${row['category_avg']:.2f}"
-                    )
-                    print(f"     Difference: +${row['price_difference']:.2f}")
-                    print()
+            lines = map(
+                ABOVE_AVG_ROW.format_map,
+                self.db.execute_query_stream(above_avg_query, dictionary=True),
+            )
+            sys.stdout.write("".join(lines))
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -257,26 +317,33 @@ class IntermediateExercises:
                 daily_total,
                 SUM(daily_total) OVER (ORDER BY sale_date) as running_total
             FROM daily_sales
+        ),
+        sales_total AS (
+            SELECT SUM(daily_total) as grand_total FROM daily_sales
         )
         SELECT 
-            sale_date,
-            daily_total,
-            running_total,
-            ROUND((running_total / (SELECT SUM(daily_total) FROM daily_sales)) * 100, 2) as percent_of_total
-        FROM running_totals
-        ORDER BY sale_date
+            r.sale_date,
+            r.daily_total,
+            r.running_total,
+            ROUND((r.running_total / t.grand_total) * 100, 2) as percent_of_total
+        FROM running_totals r
+        CROSS JOIN sales_total t
+        ORDER BY r.sale_date
         """
 
         try:
-            results = self.db.execute_query(cte_query)
-            if results:
-                for row in results:
-                    print(f"   {row['sale_date']}: ${row['daily_total']:.2f}")
-                    print(
-                        f"     Running Total: ${row['running_total']:.2f} ({row['percent_of_total']:.1f}%)"
-                    )
-        except Exception as e:
-            print(f"   Error (CTEs may not be supported in older MySQL): {e}")
+            error_before = self.db.last_error
+            output = "".join(
+                map(
+                    RUNNING_TOTAL_ROW.format_map,
+                    self.db.execute_query_stream(cte_query, dictionary=True),
+                )
+            )
+            if self.db.last_error is error_before:
+                sys.stdout.write(output)
+                return
+
+            print("   CTEs may not be supported in older MySQL, retrying without")
             # Fallback without CTE
             fallback_query = """
             SELECT 
@@ -286,16 +353,20 @@ class IntermediateExercises:
             GROUP BY DATE(order_date)
             ORDER BY sale_date
             """
-            try:
-                results = self.db.execute_query(fallback_query)
-                if results:
-                    running_total = 0
-                    for row in results:
-                        running_total += float(row["daily_total"])
-                        print(f"   {row['sale_date']}: ${row['daily_total']:.2f}")
-                        print(f"     Running Total: ${running_total:.2f}")
-            except Exception as e2:
-                print(f"   Fallback Error: {e2}")
+            error_before = self.db.last_error
+            # tee() walks both copies in step, so rows still stream
+            rows, totals = tee(
+                self.db.execute_query_stream(fallback_query, dictionary=True)
+            )
+            running_totals = accumulate(float(row["daily_total"]) for row in totals)
+            output = "".join(
+                FALLBACK_RUNNING_TOTAL_ROW.format(running_total=running_total, **row)
+                for row, running_total in zip(rows, running_totals)
+            )
+            if self.db.last_error is error_before:
+                sys.stdout.write(output)
+        except Exception as e:
+            print(f"   Error: {e}")
 
     def exercise_3_data_analysis(self):
         """
@@ -315,41 +386,44 @@ class IntermediateExercises:
         # Task 1: Customer segmentation
         print("\n1. Customer segmentation by spending:")
         segmentation_query = """
-        SELECT 
-            customer_segment,
-            COUNT(*) as customer_count,
-            AVG(total_spent) as avg_spent,
-            MIN(total_spent) as min_spent,
-            MAX(total_spent) as max_spent
-        FROM (
+        WITH segments (lower_bound, upper_bound, customer_segment) AS (
+            SELECT 0, 0.01, 'No Purchase'
+            UNION ALL SELECT 0.01, 100, 'Low Value'
+            UNION ALL SELECT 100, 500, 'Medium Value'
+            UNION ALL SELECT 500, 1000, 'High Value'
+            UNION ALL SELECT 1000, NULL, 'Premium'
+        ),
+        customer_totals AS (
             SELECT 
                 c.customer_id,
-                CONCAT(c.first_name, ' ', c.last_name) as customer_name,
-                COALESCE(SUM(o.total_amount), 0) as total_spent,
-                CASE 
-                    WHEN COALESCE(SUM(o.total_amount), 0) = 0 THEN 'No Purchase'
-                    WHEN COALESCE(SUM(o.total_amount), 0) < 100 THEN 'Low Value'
-                    WHEN COALESCE(SUM(o.total_amount), 0) < 500 THEN 'Medium Value'
-                    WHEN COALESCE(SUM(o.total_amount), 0) < 1000 THEN 'High Value'
-                    ELSE 'Premium'
-                END as customer_segment
+                COALESCE(SUM(o.total_amount), 0) as total_spent
             FROM customers c
             LEFT JOIN orders o ON c.customer_id = o.customer_id
-            GROUP BY c.customer_id, c.first_name, c.last_name
-        ) as segmented_customers
-        GROUP BY customer_segment
+            GROUP BY c.customer_id
+        )
+        SELECT 
+            s.customer_segment,
+            COUNT(*) as customer_count,
+            AVG(ct.total_spent) as avg_spent,
+            MIN(ct.total_spent) as min_spent,
+            MAX(ct.total_spent) as max_spent
+        FROM customer_totals ct
+        JOIN segments s
+            ON ct.total_spent >= s.lower_bound
+            AND (s.upper_bound IS NULL OR ct.total_spent < s.upper_bound)
+        GROUP BY s.customer_segment
         ORDER BY avg_spent DESC
         """
 
         try:
-            results = self.db.execute_query(segmentation_query)
-            if results:
-                print("   Segment      | Count | Avg Spent | Min Spent | Max Spent")
-                print("   -------------|-------|-----------|-----------|----------")
-                for row in results:
-                    print(
-                        f"   {row['customer_segment']:12} | {row['customer_count']:5d} | ${row['avg_spent']:8.2f} | ${row['min_spent']:8.2f} | ${row['max_spent']:8.2f}"
-                    )
+            report = "".join(
+                map(
+                    SEGMENT_ROW.format_map,
+                    self.db.execute_query_stream(segmentation_query, dictionary=True),
+                )
+            )
+            if report:
+                sys.stdout.write(SEGMENT_HEADER + report)
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -373,20 +447,11 @@ class IntermediateExercises:
         """
 
         try:
-            results = self.db.execute_query(performance_query)
-            if results:
-                for row in results:
-                    print(f"   {row['category_name']}:")
-                    print(
-                        f"     Products: {row['total_products']} total, {row['products_sold']} sold ({row['sell_through_rate']:.1f}%)"
-                    )
-                    print(
-                        f"     Units Sold: {row['total_units_sold']}, Revenue: ${row['total_revenue']:.2f}"
-                    )
-                    print(
-                        f"     Avg Selling Price: ${row['avg_selling_price']:.2f} vs List: ${row['avg_list_price']:.2f}"
-                    )
-                    print()
+            lines = map(
+                CATEGORY_PERFORMANCE_ROW.format_map,
+                self.db.execute_query_stream(performance_query, dictionary=True),
+            )
+            sys.stdout.write("".join(lines))
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -406,17 +471,14 @@ class IntermediateExercises:
         """
 
         try:
-            results = self.db.execute_query(pattern_query)
-            if results:
-                print("   Top Order Times:")
-                for row in results:
-                    print(
-                        f"   {row['day_of_week']} {row['hour_of_day']:02d}:00 - {row['order_count']} orders"
-                    )
-                    print(
-                        f"     Avg: ${row['avg_order_value']:.2f}, Total: ${row['total_revenue']:.2f}"
-                    )
-                    print()
+            report = "".join(
+                map(
+                    ORDER_PATTERN_ROW.format_map,
+                    self.db.execute_query_stream(pattern_query, dictionary=True),
+                )
+            )
+            if report:
+                sys.stdout.write("   Top Order Times:\n" + report)
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -457,13 +519,14 @@ class IntermediateExercises:
         try:
             # Show explain plan
             explain_query = f"EXPLAIN {slow_query}"
-            explain_results = self.db.execute_query(explain_query)
-            if explain_results:
-                print("   EXPLAIN output for complex query:")
-                for row in explain_results:
-                    print(
-                        f"   Table: {row.get('table', 'N/A')}, Type: {row.get('type', 'N/A')}, Rows: {row.get('rows', 'N/A')}"
-                    )
+            report = "".join(
+                map(
+                    EXPLAIN_ROW.format_map,
+                    self.db.execute_query_stream(explain_query, dictionary=True),
+                )
+            )
+            if report:
+                sys.stdout.write("   EXPLAIN output for complex query:\n" + report)
         except Exception as e:
             print(f"   Error analyzing query: {e}")
 
@@ -482,27 +545,20 @@ class IntermediateExercises:
         """
 
         try:
-            results = self.db.execute_query(index_query)
-            if results:
-                current_table = ""
-                current_index = ""
-                for row in results:
-                    if row["TABLE_NAME"] != current_table:
-                        current_table = row["TABLE_NAME"]
-                        print(f"\n   {current_table}:")
-
-                    if row["INDEX_NAME"] != current_index:
-                        current_index = row["INDEX_NAME"]
-                        unique_text = (
-                            "UNIQUE" if row["NON_UNIQUE"] == 0 else "NON-UNIQUE"
-                        )
-                        print(
-                            f"     {row['INDEX_NAME']} ({unique_text}): {row['COLUMN_NAME']}",
-                            end="",
-                        )
-                    else:
-                        print(f", {row['COLUMN_NAME']}", end="")
-                print()  # Final newline
+            lines = []
+            rows = self.db.execute_query_stream(index_query, dictionary=True)
+            for table_name, table_rows in groupby(rows, itemgetter("TABLE_NAME")):
+                lines.append(f"\n   {table_name}:\n")
+                for index_name, index_rows in groupby(
+                    table_rows, itemgetter("INDEX_NAME")
+                ):
+                    index_rows = list(index_rows)
+                    unique_text = (
+                        "UNIQUE" if index_rows[0]["NON_UNIQUE"] == 0 else "NON-UNIQUE"
+                    )
+                    columns = ", ".join(map(itemgetter("COLUMN_NAME"), index_rows))
+                    lines.append(f"     {index_name} ({unique_text}): {columns}\n")
+            sys.stdout.write("".join(lines))
         except Exception as e:
             print(f"   Error: {e}")
 
@@ -522,8 +578,7 @@ class IntermediateExercises:
             "  - Consider partitioning large tables by date",
         ]
 
-        for suggestion in suggestions:
-            print(f"   {suggestion}")
+        sys.stdout.write("".join(f"   {suggestion}\n" for suggestion in suggestions))
 
 
 def main():
@@ -534,14 +589,16 @@ def main():
     exercises = IntermediateExercises()
 
     try:
-        if not exercises.setup():
+        pool = create_connection_pool("intermediate_exercises", len(EXERCISE_METHODS))
+        if pool:
+            # Overlap the exercises' database waits; each one's output is
+            # printed in the original order
+            run_concurrently(pool, IntermediateExercises, EXERCISE_METHODS)
+        elif exercises.setup():
+            for method_name in EXERCISE_METHODS:
+                getattr(exercises, method_name)()
+        else:
             print("Failed to connect to database. Please check your configuration.")
-            return
-
-        exercises.exercise_1_complex_joins()
-        exercises.exercise_2_subqueries_cte()
-        exercises.exercise_3_data_analysis()
-        exercises.exercise_4_indexes_performance()
 
     except Exception as e:
         print(f"Error: {e}")
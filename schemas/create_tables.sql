@@ -29,8 +29,10 @@ CREATE TABLE customers (
     state VARCHAR(50),
     zip_code VARCHAR(10),
     country VARCHAR(50) DEFAULT 'USA',
+    email_domain VARCHAR(100) GENERATED ALWAYS AS (SUBSTRING_INDEX(email, '@', -1)) STORED,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_customer_domain_city (email_domain, city)
 );
 
 -- Create products table
@@ -61,9 +63,13 @@ CREATE TABLE orders (
     shipping_address TEXT,
     billing_address TEXT,
     notes TEXT,
+    order_day DATE GENERATED ALWAYS AS (DATE(order_date)) STORED,
+    ym CHAR(7) GENERATED ALWAYS AS (DATE_FORMAT(order_date, '%Y-%m')) STORED,
     FOREIGN KEY (customer_id) REFERENCES customers(customer_id) ON DELETE CASCADE,
     INDEX idx_customer (customer_id),
     INDEX idx_order_date (order_date),
+    INDEX idx_order_day (order_day, total_amount, customer_id),
+    INDEX idx_ym_total (ym, total_amount),
     INDEX idx_status (status)
 );
 
@@ -77,7 +83,7 @@ CREATE TABLE order_items (
     total_price DECIMAL(10, 2) GENERATED ALWAYS AS (quantity * unit_price) STORED,
     FOREIGN KEY (order_id) REFERENCES orders(order_id) ON DELETE CASCADE,
     FOREIGN KEY (product_id) REFERENCES products(product_id) ON DELETE CASCADE,
-    INDEX idx_order (order_id),
+    INDEX idx_oi_order_product (order_id, product_id),
     INDEX idx_product (product_id)
 );
 
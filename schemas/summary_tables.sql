@@ -0,0 +1,107 @@
+-- Optional summary tables for exercises/advanced.py (exercise 2)
+-- Run after create_tables.sql, e.g. SOURCE schemas/summary_tables.sql;
+--
+-- Without them the exercise aggregates orders and order_items directly.
+-- With them, triggers on orders and order_items log the customer/product ids
+-- each write touches into the *_mlog tables, and the exercise refreshes only
+-- those keys. The logs grow with every write until the next refresh.
+-- Foreign-key cascades do not fire triggers, so after deleting customers
+-- drop the tables (see below) and re-run this script to rebuild them.
+--
+-- To remove them again:
+--   DROP TRIGGER IF EXISTS clv_mlog_order_insert;
+--   DROP TRIGGER IF EXISTS clv_mlog_order_update;
+--   DROP TRIGGER IF EXISTS clv_mlog_order_delete;
+--   DROP TRIGGER IF EXISTS affinity_mlog_item_insert;
+--   DROP TRIGGER IF EXISTS affinity_mlog_item_update;
+--   DROP TRIGGER IF EXISTS affinity_mlog_item_delete;
+--   DROP TRIGGER IF EXISTS affinity_mlog_order_delete;
+--   DROP TABLE IF EXISTS customer_clv_mlog, customer_clv_mv,
+--       product_affinity_mlog, product_orders_mv, product_affinity_mv;
+
+-- Customer lifetime value
+CREATE TABLE IF NOT EXISTS customer_clv_mlog (
+    log_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    customer_id INT NOT NULL,
+    dmltype CHAR(1) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS customer_clv_mv (
+    customer_id INT PRIMARY KEY,
+    total_orders INT NOT NULL,
+    total_revenue DECIMAL(12, 2) NOT NULL,
+    first_order TIMESTAMP NULL,
+    last_order TIMESTAMP NULL,
+    INDEX idx_clv_revenue (total_revenue)
+);
+
+-- Product affinity
+CREATE TABLE IF NOT EXISTS product_affinity_mlog (
+    log_id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    product_id INT NOT NULL,
+    dmltype CHAR(1) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS product_orders_mv (
+    product_id INT PRIMARY KEY,
+    order_count INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS product_affinity_mv (
+    product_a INT NOT NULL,
+    product_b INT NOT NULL,
+    times_bought_together INT NOT NULL,
+    PRIMARY KEY (product_a, product_b),
+    INDEX idx_affinity_count (times_bought_together)
+);
+
+-- Change-log triggers
+DROP TRIGGER IF EXISTS clv_mlog_order_insert;
+CREATE TRIGGER clv_mlog_order_insert AFTER INSERT ON orders
+FOR EACH ROW
+    INSERT INTO customer_clv_mlog (customer_id, dmltype)
+    VALUES (NEW.customer_id, 'I');
+
+DROP TRIGGER IF EXISTS clv_mlog_order_update;
+CREATE TRIGGER clv_mlog_order_update AFTER UPDATE ON orders
+FOR EACH ROW
+    INSERT INTO customer_clv_mlog (customer_id, dmltype)
+    VALUES (OLD.customer_id, 'U'), (NEW.customer_id, 'U');
+
+DROP TRIGGER IF EXISTS clv_mlog_order_delete;
+CREATE TRIGGER clv_mlog_order_delete AFTER DELETE ON orders
+FOR EACH ROW
+    INSERT INTO customer_clv_mlog (customer_id, dmltype)
+    VALUES (OLD.customer_id, 'D');
+
+DROP TRIGGER IF EXISTS affinity_mlog_item_insert;
+CREATE TRIGGER affinity_mlog_item_insert AFTER INSERT ON order_items
+FOR EACH ROW
+    INSERT INTO product_affinity_mlog (product_id, dmltype)
+    VALUES (NEW.product_id, 'I');
+
+DROP TRIGGER IF EXISTS affinity_mlog_item_update;
+CREATE TRIGGER affinity_mlog_item_update AFTER UPDATE ON order_items
+FOR EACH ROW
+    INSERT INTO product_affinity_mlog (product_id, dmltype)
+    VALUES (OLD.product_id, 'U'), (NEW.product_id, 'U');
+
+DROP TRIGGER IF EXISTS affinity_mlog_item_delete;
+CREATE TRIGGER affinity_mlog_item_delete AFTER DELETE ON order_items
+FOR EACH ROW
+    INSERT INTO product_affinity_mlog (product_id, dmltype)
+    VALUES (OLD.product_id, 'D');
+
+-- Deleting an order cascades to its items without firing the triggers above
+DROP TRIGGER IF EXISTS affinity_mlog_order_delete;
+CREATE TRIGGER affinity_mlog_order_delete BEFORE DELETE ON orders
+FOR EACH ROW
+    INSERT INTO product_affinity_mlog (product_id, dmltype)
+    SELECT product_id, 'D' FROM order_items WHERE order_id = OLD.order_id;
+
+-- Log every existing key, so the exercise's first refresh is a full build
+INSERT INTO customer_clv_mlog (customer_id, dmltype)
+SELECT DISTINCT customer_id, 'I' FROM orders;
+
+INSERT INTO product_affinity_mlog (product_id, dmltype)
+SELECT DISTINCT product_id, 'I' FROM order_items;
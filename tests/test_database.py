@@ -6,10 +6,13 @@ Test suite for validating database operations and query functionality.
 import os
 import sys
 import unittest
+from unittest import mock
+
+from mysql.connector import Error
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.database import MySQLConnection
+from config.database import DatabaseConfig, MySQLConnection
 from tests.test_config import is_database_available
 
 
@@ -204,6 +207,154 @@ class TestPerformance(unittest.TestCase):
             self.assertGreater(result[0]["pk_count"], 0, "No primary key indexes found")
 
 
+class TestConnectionHelpers(unittest.TestCase):
+    """Test MySQLConnection helpers against a mocked connection (no database)."""
+
+    def setUp(self):
+        """Create a MySQLConnection wired to mock connection and cursor objects."""
+        self.db = MySQLConnection()
+        self.db.connection = mock.MagicMock()
+        self.db.connection.in_transaction = True
+        self.db.cursor = mock.MagicMock()
+
+    def test_connect_returns_pooled_connection_on_failure(self):
+        """Test that a failed session setup hands the connection back to the pool."""
+        pool = mock.MagicMock()
+        connection = pool.get_connection.return_value
+        connection.cursor.return_value.execute.side_effect = Error("bad level")
+        db = MySQLConnection(pool=pool, isolation_level="NOT A LEVEL")
+
+        self.assertFalse(db.connect())
+        connection.close.assert_called_once_with()
+        self.assertIsNone(db.connection)
+
+    def test_transaction_commits_once(self):
+        """Test that a successful transaction block commits once at the end."""
+        with self.db.transaction():
+            self.db.execute_update("UPDATE t SET a = 1")
+            self.db.execute_update("UPDATE t SET b = 2")
+
+        self.db.connection.commit.assert_called_once_with()
+        self.db.connection.rollback.assert_not_called()
+
+    def test_transaction_rolls_back_when_a_helper_fails(self):
+        """Test that a helper error inside the block rolls back the whole block."""
+        self.db.cursor.execute.side_effect = [None, Error("boom")]
+
+        with self.db.transaction():
+            self.db.execute_update("UPDATE t SET a = 1")
+            self.db.execute_update("UPDATE t SET b = 2")
+
+        self.db.connection.commit.assert_not_called()
+        self.db.connection.rollback.assert_called_once_with()
+        self.assertEqual(str(self.db.last_error), "boom")
+
+    def test_transaction_rolls_back_on_exception(self):
+        """Test that an exception raised in the block rolls back and propagates."""
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.execute_update("UPDATE t SET a = 1")
+                raise ValueError("stop")
+
+        self.db.connection.commit.assert_not_called()
+        self.db.connection.rollback.assert_called_once_with()
+
+    def test_execute_script(self):
+        """Test that execute_script returns each statement's rowcount and commits."""
+        results = [
+            mock.Mock(statement="DELETE FROM t", rowcount=3, with_rows=False),
+            mock.Mock(statement="SELECT 1", rowcount=1, with_rows=True),
+        ]
+        self.db.cursor.execute.return_value = iter(results)
+
+        executed = self.db.execute_script("DELETE FROM t; SELECT 1")
+
+        self.assertEqual(executed, [("DELETE FROM t", 3), ("SELECT 1", 1)])
+        self.db.cursor.execute.assert_called_once_with(
+            "DELETE FROM t; SELECT 1", (), multi=True
+        )
+        results[1].fetchall.assert_called_once_with()
+        self.db.connection.commit.assert_called_once_with()
+
+    def test_execute_script_error(self):
+        """Test that a failing script rolls back and returns an empty list."""
+        self.db.cursor.execute.side_effect = Error("bad script")
+
+        self.assertEqual(self.db.execute_script("DELETE FROM t"), [])
+        self.db.connection.commit.assert_not_called()
+        self.db.connection.rollback.assert_called_once_with()
+        self.assertIsNotNone(self.db.last_error)
+
+    def test_execute_query_stream_limit(self):
+        """Test that limit appends a LIMIT placeholder and its parameter."""
+        cursor = self.db.connection.cursor.return_value
+        cursor.fetchmany.side_effect = [[(1,), (2,)], []]
+
+        rows = list(
+            self.db.execute_query_stream(
+                "SELECT a FROM t WHERE b = %s\n", (5,), limit=10
+            )
+        )
+
+        self.assertEqual(rows, [(1,), (2,)])
+        cursor.execute.assert_called_once_with(
+            "SELECT a FROM t WHERE b = %s LIMIT %s", (5, 10)
+        )
+
+    def test_execute_query_stream_early_break_drains(self):
+        """Test that stopping a stream early reads the rest of the result."""
+        cursor = self.db.connection.cursor.return_value
+        cursor.fetchmany.return_value = [(1,), (2,)]
+
+        stream = self.db.execute_query_stream("SELECT a FROM t")
+        self.assertEqual(next(stream), (1,))
+        stream.close()
+
+        cursor.fetchall.assert_called_once_with()
+        cursor.close.assert_called_once_with()
+
+    def test_prepared_cursor_lru(self):
+        """Test that the prepared statement cache evicts the least recently used."""
+        self.db.connection.cursor.side_effect = lambda **kwargs: mock.MagicMock()
+
+        with mock.patch.object(DatabaseConfig, "STMT_CACHE_SIZE", 2):
+            _, cursor_a = self.db._prepared_cursor("SELECT a", dictionary=False)
+            _, cursor_b = self.db._prepared_cursor("SELECT b", dictionary=False)
+            # Touching "SELECT a" makes "SELECT b" the least recently used
+            self.assertIs(
+                self.db._prepared_cursor("SELECT a", dictionary=False)[1], cursor_a
+            )
+            self.db._prepared_cursor("SELECT c", dictionary=False)
+
+        cursor_b.close.assert_called_once_with()
+        cursor_a.close.assert_not_called()
+        self.assertEqual(
+            list(self.db._stmt_cache), [("SELECT a", False), ("SELECT c", False)]
+        )
+        self.assertEqual(
+            self.db.prepared_cache_stats(), {"size": 2, "hits": 1, "misses": 3}
+        )
+
+    def test_execute_update_with_id(self):
+        """Test that execute_update_with_id returns the inserted row's id."""
+        self.db.cursor.lastrowid = 42
+
+        self.assertEqual(
+            self.db.execute_update_with_id("INSERT INTO t (a) VALUES (%s)", (1,)), 42
+        )
+        self.db.connection.commit.assert_called_once_with()
+
+    def test_execute_update_with_id_error(self):
+        """Test that a failing insert rolls back and returns None."""
+        self.db.cursor.execute.side_effect = Error("duplicate")
+
+        self.assertIsNone(
+            self.db.execute_update_with_id("INSERT INTO t (a) VALUES (%s)", (1,))
+        )
+        self.db.connection.rollback.assert_called_once_with()
+        self.assertEqual(str(self.db.last_error), "duplicate")
+
+
 if __name__ == "__main__":
     # Check database availability first
     if not is_database_available():
@@ -222,6 +373,7 @@ if __name__ == "__main__":
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestDatabaseOperations))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformance))
+    suite.addTests(loader.loadTestsFromTestCase(TestConnectionHelpers))
 
     # Run with detailed output
     runner = unittest.TextTestRunner(verbosity=2)
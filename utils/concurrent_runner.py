@@ -0,0 +1,75 @@
+"""
+MySQL Practice Project - Concurrent Runner
+Run independent demo/exercise methods in parallel on pooled connections.
+"""
+
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, Sequence
+
+from mysql.connector import pooling
+
+
+class ThreadLocalStdout(io.TextIOBase):
+    """Stdout proxy that lets each worker thread capture its own output."""
+
+    def __init__(self, target):
+        self._target = target
+        self._local = threading.local()
+
+    def capture(self, buffer: Optional[io.StringIO]):
+        self._local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        return (getattr(self._local, "buffer", None) or self._target).write(text)
+
+    def flush(self):
+        self._target.flush()
+
+
+def run_captured(
+    pool: pooling.MySQLConnectionPool,
+    stdout: ThreadLocalStdout,
+    factory: Callable[[pooling.MySQLConnectionPool], Any],
+    method_name: str,
+) -> str:
+    """Run one method on a fresh factory(pool) instance and return its output.
+
+    The instance needs setup() and cleanup(), like the example classes.
+    """
+    buffer = io.StringIO()
+    stdout.capture(buffer)
+    instance = factory(pool)
+    try:
+        if instance.setup():
+            getattr(instance, method_name)()
+    finally:
+        instance.cleanup()
+        stdout.capture(None)
+    return buffer.getvalue()
+
+
+def run_concurrently(
+    pool: pooling.MySQLConnectionPool,
+    factory: Callable[[pooling.MySQLConnectionPool], Any],
+    method_names: Sequence[str],
+):
+    """Run the methods in parallel, one pooled connection each.
+
+    Each method's output is captured and printed in the original order.
+    """
+    original_stdout = sys.stdout
+    stdout = ThreadLocalStdout(original_stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(method_names)) as executor:
+            outputs = executor.map(
+                partial(run_captured, pool, stdout, factory), method_names
+            )
+            for output in outputs:
+                original_stdout.write(output)
+    finally:
+        sys.stdout = original_stdout
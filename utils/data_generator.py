@@ -371,33 +371,31 @@ class DataGenerator:
 
                 # Generate 1-5 order items
                 num_items = random.randint(1, 5)
-                order_total = 0.00
-
+                items = []
                 for _ in range(num_items):
                     product = random.choice(products)
                     quantity = random.randint(1, 3)
-                    unit_price = product["price"]
-                    order_total += unit_price * quantity
-
-                    # Insert order item (total_price is calculated automatically)
-                    item_query = """
-                    INSERT INTO order_items (order_id, product_id, quantity, unit_price)
-                    VALUES (%s, %s, %s, %s)
-                    """
-
-                    self.db.execute_update(
-                        item_query,
-                        (
-                            order_id,
-                            product["product_id"],
-                            quantity,
-                            unit_price,
-                        ),
+                    items.append(
+                        (order_id, product["product_id"], quantity, product["price"])
                     )
 
-                # Update order total
-                update_query = "UPDATE orders SET total_amount = %s WHERE order_id = %s"
-                self.db.execute_update(update_query, (order_total, order_id))
+                # Insert all order items at once; executemany sends a single
+                # multi-row INSERT (total_price is calculated automatically)
+                item_query = """
+                INSERT INTO order_items (order_id, product_id, quantity, unit_price)
+                VALUES (%s, %s, %s, %s)
+                """
+                self.db.execute_many(item_query, items)
+
+                # Total the order from its items on the server
+                update_query = """
+                UPDATE orders
+                SET total_amount = (
+                    SELECT SUM(total_price) FROM order_items WHERE order_id = %s
+                )
+                WHERE order_id = %s
+                """
+                self.db.execute_update(update_query, (order_id, order_id))
 
                 orders_generated += 1
 
@@ -420,7 +418,8 @@ class DataGenerator:
         print("Creating analytical views...")
 
         views = [
-            # Customer summary view
+            # Customer summary view (COUNT(o.order_id) gives 0 for customers
+            # whose LEFT JOIN row has no order)
             (
                 "customer_summary",
                 """
@@ -431,7 +430,7 @@ class DataGenerator:
                     c.email,
                     c.city,
                     c.state,
-                    COUNT(DISTINCT o.order_id) as total_orders,
+                    COUNT(o.order_id) as total_orders,
                     COALESCE(SUM(o.total_amount), 0) as total_spent,
                     COALESCE(AVG(o.total_amount), 0) as avg_order_value,
                     MAX(o.order_date) as last_order_date,
@@ -471,7 +470,7 @@ class DataGenerator:
                     YEAR(order_date) as year,
                     MONTH(order_date) as month,
                     DATE_FORMAT(order_date, '%Y-%m') as year_month,
-                    COUNT(DISTINCT order_id) as total_orders,
+                    COUNT(*) as total_orders,
                     COUNT(DISTINCT customer_id) as unique_customers,
                     SUM(total_amount) as total_revenue,
                     AVG(total_amount) as avg_order_value,